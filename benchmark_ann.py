@@ -0,0 +1,57 @@
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import typer
+
+from src.ann_index import IVFIndex
+from src.vector_index import VectorIndex
+
+
+def main(
+    num_rows: int = typer.Option(200000, "--num-rows", help="Number of synthetic job vectors to index"),
+    dim: int = typer.Option(256, "--dim", help="Dimension of the vectors"),
+    num_queries: int = typer.Option(50, "--num-queries", help="Number of queries to average over"),
+    k: int = typer.Option(100, "--top-k", "-k", help="Number of nearest neighbours to retrieve"),
+    num_lists: int = typer.Option(0, "--num-lists", help="Number of IVF lists (0 for about 4 * sqrt(rows))"),
+    nprobe: list[int] = typer.Option([1, 4, 8, 16, 32], "--nprobe", help="Numbers of lists to probe"),
+    index_dir: Path = typer.Option(None, "--index-dir", help="Directory for the indexes (a temporary one by default)"),
+) -> None:
+    """
+    Compare the recall and latency of the approximate (IVF) index against exact search
+    on a synthetic, clustered corpus of embeddings.
+    """
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        exact = VectorIndex(Path(index_dir or tmp_dir))
+        if len(exact) < num_rows:
+            # Clustered vectors, like embeddings of postings that share titles and skills
+            topics = rng.standard_normal((1000, dim)).astype(np.float32)
+            for start in range(len(exact), num_rows, 50000):
+                size = min(50000, num_rows - start)
+                vectors = topics[rng.integers(0, len(topics), size)] + 0.5 * rng.standard_normal((size, dim))
+                exact.add([f"job-{i}" for i in range(start, start + size)], vectors)
+
+        ann = IVFIndex(exact, num_lists=num_lists or None, min_rows=0)
+        started = time.perf_counter()
+        ann.update()
+        typer.echo(f"Built IVF index over {len(exact)} vectors in {time.perf_counter() - started:.1f}s")
+
+        queries = exact.get(list(rng.choice(exact.keys, num_queries))) + 0.3 * rng.standard_normal((num_queries, dim))
+
+        started = time.perf_counter()
+        truth = [{row for row, _ in exact.search(query, k)} for query in queries]
+        exact_ms = (time.perf_counter() - started) / num_queries * 1000
+        typer.echo(f"exact        {exact_ms:8.2f} ms/query  recall@{k} 1.000")
+
+        for probes in nprobe:
+            started = time.perf_counter()
+            results = [{row for row, _ in ann.search(query, k, nprobe=probes)} for query in queries]
+            ann_ms = (time.perf_counter() - started) / num_queries * 1000
+            recall = np.mean([len(result & expected) / len(expected) for result, expected in zip(results, truth)])
+            typer.echo(f"nprobe={probes:<5} {ann_ms:8.2f} ms/query  recall@{k} {recall:.3f}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import httpx
+import typer
+
+from src.sources import AshbyAdapter, GreenhouseAdapter, LeverAdapter, SourceAdapter, find_adapter
+from src.types import JobSchema
+
+BASE_URL = "http://ats.test"
+
+GREENHOUSE_CONTENT = (
+    "&lt;h3&gt;What you'll do&lt;/h3&gt;&lt;ul&gt;&lt;li&gt;Build things&lt;/li&gt;&lt;/ul&gt;"
+    "&lt;h3&gt;You may be a good fit if you have&lt;/h3&gt;"
+    "&lt;ul&gt;&lt;li&gt;Python&lt;/li&gt;&lt;li&gt;Distributed systems&lt;/li&gt;&lt;/ul&gt;"
+    "&lt;p&gt;The expected salary range for this position is: $300,000 - $405,000 USD&lt;/p&gt;"
+)
+
+# Sample responses of each board API, keyed by request path
+RESPONSES = {
+    "/v1/boards/acme/jobs": {
+        "jobs": [
+            {
+                "title": "Research Engineer",
+                "absolute_url": "https://job-boards.greenhouse.io/acme/jobs/1",
+                "location": {"name": "SF"},
+                "departments": [{"name": "Research"}],
+                "content": GREENHOUSE_CONTENT,
+            }
+        ]
+    },
+    "/v0/postings/acme": [
+        {
+            "text": "Backend Engineer",
+            "hostedUrl": "https://jobs.lever.co/acme/abc",
+            "categories": {"team": "Platform", "location": "NYC"},
+            "lists": [{"text": "Requirements", "content": "<li>Go</li><li>Kubernetes</li>"}],
+            "salaryRange": {"min": 150000, "max": 200000, "currency": "USD", "interval": "per-year-salary"},
+        }
+    ],
+    "/posting-api/job-board/acme": {
+        "jobs": [
+            {
+                "title": "ML Engineer",
+                "team": "ML",
+                "location": "Remote",
+                "jobUrl": "https://jobs.ashbyhq.com/acme/x",
+                "descriptionHtml": "<h2>Qualifications</h2><ul><li>PyTorch</li></ul>",
+                "compensation": {"compensationTierSummary": "$200K – $250K"},
+                "isListed": True,
+            },
+            {"title": "Unlisted", "jobUrl": "https://jobs.ashbyhq.com/acme/y", "isListed": False},
+        ]
+    },
+}
+
+# Jobs page URL, adapter and the jobs it must map the sample response to
+EXPECTED: list[tuple[str, SourceAdapter, list[JobSchema]]] = [
+    (
+        "https://boards.greenhouse.io/embed/job_board?for=acme",
+        GreenhouseAdapter(BASE_URL),
+        [
+            JobSchema(
+                job_title="Research Engineer",
+                sub_division_of_organization="Research",
+                key_skills=["Python", "Distributed systems"],
+                compensation="$300,000 - $405,000 USD",
+                location="SF",
+                apply_link="https://job-boards.greenhouse.io/acme/jobs/1",
+            )
+        ],
+    ),
+    (
+        "https://jobs.lever.co/acme",
+        LeverAdapter(BASE_URL),
+        [
+            JobSchema(
+                job_title="Backend Engineer",
+                sub_division_of_organization="Platform",
+                key_skills=["Go", "Kubernetes"],
+                compensation="150,000-200,000 USD per year salary",
+                location="NYC",
+                apply_link="https://jobs.lever.co/acme/abc",
+            )
+        ],
+    ),
+    (
+        "https://jobs.ashbyhq.com/acme",
+        AshbyAdapter(BASE_URL),
+        [
+            JobSchema(
+                job_title="ML Engineer",
+                sub_division_of_organization="ML",
+                key_skills=["PyTorch"],
+                compensation="$200K – $250K",
+                location="Remote",
+                apply_link="https://jobs.ashbyhq.com/acme/x",
+            )
+        ],
+    ),
+]
+
+
+def handle(request: httpx.Request) -> httpx.Response:
+    if request.url.path not in RESPONSES:
+        return httpx.Response(404)
+    return httpx.Response(200, content=json.dumps(RESPONSES[request.url.path]).encode())
+
+
+def main() -> None:
+    """
+    Check that the Greenhouse, Lever and Ashby adapters recognise their jobs page URLs and map
+    sample board API responses to the expected jobs, against a mock transport instead of the real APIs.
+    """
+
+    async def check() -> int:
+        failures = 0
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handle)) as client:
+            for url, adapter, expected in EXPECTED:
+                match = find_adapter(url, [adapter])
+                if match is None:
+                    typer.echo(f"FAIL {adapter.name}: {url} not recognised")
+                    failures += 1
+                    continue
+                jobs = await adapter.fetch_jobs(client, match[1])
+                if jobs != expected:
+                    typer.echo(f"FAIL {adapter.name}: expected {expected}, got {jobs}")
+                    failures += 1
+                else:
+                    typer.echo(f"ok   {adapter.name}: {len(jobs)} jobs from {url}")
+        return failures
+
+    if asyncio.run(check()):
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    typer.run(main)
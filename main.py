@@ -1,16 +1,38 @@
 import json
 from pathlib import Path
+from typing import Optional
 
 import typer
 from dotenv import load_dotenv
 
 from src.api import initialize_api_clients
+from src.early_stop import EarlyStopPolicy
+from src.links import posting_key
 from src.logger import logger
-from src.services import get_job_recommendations, process_job_links, scrape_jobs_page
+from src.rate_limit import RateLimiter
+from src.retry import RetryBudget
+from src.services import (
+    get_bm25_recommendations,
+    get_job_recommendations,
+    get_pointwise_recommendations,
+    merge_job_listings,
+    prioritize_jobs,
+    prioritize_listings,
+    process_job_links,
+    run_name,
+    scrape_jobs_pages,
+    shortlist_jobs,
+    shortlist_jobs_bm25,
+    stream_job_recommendations,
+)
+from src.sources import fetch_board_jobs
+from src.types import JobListing, Preranker, Ranker
 
 # Load environment variables
 load_dotenv(override=True)
 
+DEFAULT_JOBS_URL = "https://www.anthropic.com/jobs"
+
 # Create Typer app
 app = typer.Typer(
     name="ai-jobfinder",
@@ -20,11 +42,30 @@ app = typer.Typer(
 
 @app.command()
 def main(
-    jobs_url: str = typer.Option(
-        "https://www.anthropic.com/jobs",
+    jobs_url: Optional[list[str]] = typer.Option(
+        None,
         "--jobs-url",
         "-u",
-        help="URL of the jobs page to scrape",
+        help="URL of a jobs page to scrape; repeat to search several sites at once [default: https://www.anthropic.com/jobs]",
+    ),
+    urls_file: Optional[Path] = typer.Option(
+        None,
+        "--urls-file",
+        help="File with one jobs page URL per line, scraped together with any --jobs-url",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+    ),
+    local_links: bool = typer.Option(
+        True,
+        "--local-links/--llm-links",
+        help="Find job links in the jobs page HTML locally, asking the LLM only if none are found",
+    ),
+    link_pattern: Optional[list[str]] = typer.Option(
+        None,
+        "--link-pattern",
+        help="Regular expression that job posting URLs match; repeatable (default: built-in patterns and page structure)",
     ),
     resume_path: Path = typer.Option(
         "resume.txt",
@@ -52,6 +93,87 @@ def main(
         min=1,
         max=20,
     ),
+    structured_data: bool = typer.Option(
+        True,
+        "--structured-data/--no-structured-data",
+        help="Build jobs from the schema.org JobPosting data of their pages when available, skipping LLM extraction",
+    ),
+    prioritize: bool = typer.Option(
+        True,
+        "--prioritize/--page-order",
+        help="Extract the postings (and keep the board API jobs) whose title and team best match the resume first, instead of in page order",
+    ),
+    early_stop_patience: int = typer.Option(
+        0,
+        "--early-stop-patience",
+        help="Stop extracting once the local top-N has not changed for this many extractions (0 to disable)",
+        min=0,
+        max=10000,
+    ),
+    early_stop_bounds: bool = typer.Option(
+        False,
+        "--early-stop-bounds",
+        help="Stop extracting once no remaining posting's title and team could beat the local top-N",
+    ),
+    ranker: Ranker = typer.Option(
+        Ranker.llm,
+        "--ranker",
+        help=(
+            "Rank jobs with the LLM over the whole listing, with the LLM scoring each job on its own "
+            "(scores are cached, so reruns only score new jobs), or locally and offline with BM25"
+        ),
+    ),
+    prerank: Preranker = typer.Option(
+        Preranker.embedding,
+        "--prerank",
+        help="How to shortlist the top-k jobs sent to the LLM: embedding similarity or BM25",
+    ),
+    top_k: int = typer.Option(
+        100,
+        "--top-k",
+        "-k",
+        help="Number of jobs most similar to the resume to send to the LLM for ranking (0 to send all jobs)",
+        min=0,
+        max=10000,
+    ),
+    ann_nprobe: int = typer.Option(
+        0,
+        "--ann-nprobe",
+        help="Shortlist through an approximate (IVF) index probing this many lists (0 for exact search)",
+        min=0,
+        max=1000,
+    ),
+    chunk_tokens: int = typer.Option(
+        30000,
+        "--chunk-tokens",
+        help="Maximum tokens of job listings per ranking prompt; larger corpora are ranked in rounds",
+        min=1000,
+        max=100000,
+    ),
+    model: str = typer.Option(
+        "gpt-4o",
+        "--model",
+        help="OpenAI model that produces the final ranking",
+    ),
+    screen_model: Optional[str] = typer.Option(
+        None,
+        "--screen-model",
+        help="Smaller OpenAI model (e.g. gpt-4o-mini) that screens all jobs before the final ranking",
+    ),
+    screen_chunk_tokens: int = typer.Option(
+        30000,
+        "--screen-chunk-tokens",
+        help="Maximum tokens of job listings per screening prompt",
+        min=1000,
+        max=100000,
+    ),
+    finalists: int = typer.Option(
+        30,
+        "--finalists",
+        help="Number of screened jobs passed on to the final ranking model",
+        min=1,
+        max=1000,
+    ),
     rate_limit: int = typer.Option(
         10,
         "--rate-limit",
@@ -68,12 +190,66 @@ def main(
         min=1,
         max=3600,
     ),
+    max_concurrent: int = typer.Option(
+        20,
+        "--max-concurrent",
+        "-c",
+        help="Maximum number of concurrent extraction requests (adjusted adaptively up to this limit)",
+        min=1,
+        max=500,
+    ),
+    max_per_host: int = typer.Option(
+        0,
+        "--max-per-host",
+        help="Maximum number of concurrent extractions per job posting host (0 for no per-host limit)",
+        min=0,
+        max=500,
+    ),
+    batch_size: int = typer.Option(
+        1,
+        "--batch-size",
+        "-b",
+        help="Number of job links to extract per Firecrawl request",
+        min=1,
+        max=50,
+    ),
+    openai_rate_limit: int = typer.Option(
+        500,
+        "--openai-rate-limit",
+        help="Rate limit for OpenAI API requests per minute",
+        min=1,
+        max=10000,
+    ),
+    retry_budget: int = typer.Option(
+        50,
+        "--retry-budget",
+        help="Maximum number of retries of failed API requests across the whole run",
+        min=0,
+        max=10000,
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Score jobs with the LLM while they are being extracted, keeping a live top-N",
+    ),
+    score_batch_size: int = typer.Option(
+        10,
+        "--score-batch-size",
+        help="Number of extracted jobs scored together in streaming mode",
+        min=1,
+        max=1000,
+    ),
     output_dir: Path = typer.Option(
         "results",
         "--output-dir",
         "-o",
         help="Directory to save the results",
     ),
+    resume_run: bool = typer.Option(
+        False,
+        "--resume",
+        help="Resume an interrupted run from its checkpoint, only extracting the missing links",
+    ),
 ) -> None:
     """
     Main function orchestrating the job scraping, extraction, and recommendation processes.
@@ -82,6 +258,11 @@ def main(
         # Initialize API clients
         firecrawl, openai = initialize_api_clients()
 
+        # One limiter per provider, shared by every call made to that provider
+        firecrawl_limiter = RateLimiter(rate_limit, window_size)
+        openai_limiter = RateLimiter(openai_rate_limit, 60)
+        retries = RetryBudget(retry_budget)
+
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
         # Load resume with explicit encoding
@@ -91,44 +272,160 @@ def main(
             raise ValueError(f"Failed to load resume from {resume_path}")
         logger.info(f"Loaded resume from {resume_path}")
 
-        # Scrape jobs page
-        scrape_result = scrape_jobs_page(firecrawl, jobs_url, output_dir)
-        if not scrape_result:
-            raise ValueError("Failed to scrape jobs from the jobs page")
+        jobs_urls = list(jobs_url or [])
+        if urls_file:
+            lines = urls_file.read_text(encoding="utf-8").splitlines()
+            jobs_urls += [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+        if not jobs_urls:
+            jobs_urls = [DEFAULT_JOBS_URL]
+
+        # Fetch boards hosted on a supported ATS straight from its API, without scraping or extraction
+        board_jobs = fetch_board_jobs(jobs_urls, retry_budget=retries)
+        known_jobs = list({posting_key(job.apply_link): job for jobs in board_jobs.values() for job in jobs}.values())
+        scrape_urls = [url for url in jobs_urls if url not in board_jobs]
+
+        # Scrape the other jobs pages concurrently
+        listings: list[JobListing] = []
+        if scrape_urls:
+            scrape_results = scrape_jobs_pages(
+                firecrawl,
+                scrape_urls,
+                output_dir,
+                rate_limiter=firecrawl_limiter,
+                retry_budget=retries,
+                link_discovery=local_links,
+                link_patterns=link_pattern,
+            )
+            successful_results = {url: scrape_result for url, scrape_result in scrape_results.items() if scrape_result}
+            if len(successful_results) < len(scrape_urls):
+                logger.warning(
+                    f"Failed to scrape {len(scrape_urls) - len(successful_results)} of {len(scrape_urls)} jobs pages"
+                )
 
-        apply_links = scrape_result["json"].get("apply_links", [])
-        if not apply_links:
+            listings = merge_job_listings(successful_results, known_jobs)
+            logger.info(f"Successfully scraped {len(listings)} apply links from {len(successful_results)} jobs pages")
+
+        if not listings and not known_jobs:
             raise ValueError("No apply links found on the jobs page")
 
-        logger.info(f"Successfully scraped {len(apply_links)} apply links")
-
-        # Extract job data
-        jobs = process_job_links(
-            apply_links,
-            firecrawl,
-            jobs_url,
-            max_jobs=max_jobs,
-            rate_limit=rate_limit,
-            window_size=window_size,
-        )
-        if not jobs:
-            raise ValueError("No job data extracted")
-
-        logger.info(f"Successfully extracted data from {len(jobs)} jobs")
-
-        # Get recommendations
-        recommended_jobs = get_job_recommendations(
-            openai,
-            resume,
-            jobs_url,
-            jobs,
-            num_recommendations=num_recommendations,
-            output_dir=output_dir,
-        )
+        # Extract the postings that best match the resume first, and keep the best matching board jobs
+        if prioritize:
+            listings = prioritize_listings(resume, listings)
+            known_jobs = prioritize_jobs(resume, known_jobs)
+        apply_links = [listing.apply_link for listing in listings]
+
+        early_stop = None
+        if early_stop_patience or early_stop_bounds:
+            early_stop = EarlyStopPolicy(
+                resume,
+                num_recommendations,
+                listings,
+                patience=early_stop_patience,
+                use_bounds=early_stop_bounds,
+            )
+
+        if stream:
+            # Extract and rank at the same time, keeping a live top-N while jobs arrive
+            jobs, recommended_jobs = stream_job_recommendations(
+                apply_links,
+                firecrawl,
+                openai,
+                run_name(jobs_urls),
+                resume,
+                num_recommendations=num_recommendations,
+                max_jobs=max_jobs,
+                output_dir=output_dir,
+                resume_run=resume_run,
+                firecrawl_rate_limiter=firecrawl_limiter,
+                openai_rate_limiter=openai_limiter,
+                max_concurrent=max_concurrent,
+                batch_size=batch_size,
+                retry_budget=retries,
+                model=model,
+                score_batch_size=score_batch_size,
+                max_per_host=max_per_host,
+                known_jobs=known_jobs,
+                structured_data=structured_data,
+                early_stop=early_stop,
+            )
+            if not jobs:
+                raise ValueError("No job data extracted")
+        else:
+            # Extract job data
+            jobs = process_job_links(
+                apply_links,
+                firecrawl,
+                run_name(jobs_urls),
+                max_jobs=max_jobs,
+                rate_limit=rate_limit,
+                window_size=window_size,
+                output_dir=output_dir,
+                resume=resume_run,
+                rate_limiter=firecrawl_limiter,
+                max_concurrent=max_concurrent,
+                batch_size=batch_size,
+                retry_budget=retries,
+                max_per_host=max_per_host,
+                known_jobs=known_jobs,
+                structured_data=structured_data,
+                early_stop=early_stop,
+            )
+            if not jobs:
+                raise ValueError("No job data extracted")
+
+            logger.info(f"Successfully extracted data from {len(jobs)} jobs")
+
+            if ranker == Ranker.bm25:
+                # Rank the whole corpus locally; no LLM calls are made
+                recommended_jobs = get_bm25_recommendations(resume, jobs, num_recommendations)
+            else:
+                # Pre-rank jobs locally so only the closest matches are sent to the LLM
+                if top_k and prerank == Preranker.bm25:
+                    jobs = shortlist_jobs_bm25(resume, jobs, top_k)
+                elif top_k:
+                    jobs = shortlist_jobs(
+                        openai,
+                        resume,
+                        jobs,
+                        top_k,
+                        output_dir=output_dir,
+                        rate_limiter=openai_limiter,
+                        retry_budget=retries,
+                        ann_nprobe=ann_nprobe,
+                    )
+
+                # Get recommendations
+                if ranker == Ranker.pointwise:
+                    recommended_jobs = get_pointwise_recommendations(
+                        openai,
+                        resume,
+                        jobs,
+                        num_recommendations=num_recommendations,
+                        output_dir=output_dir,
+                        rate_limiter=openai_limiter,
+                        retry_budget=retries,
+                        model=model,
+                    )
+                else:
+                    recommended_jobs = get_job_recommendations(
+                        openai,
+                        resume,
+                        jobs,
+                        num_recommendations=num_recommendations,
+                        output_dir=output_dir,
+                        rate_limiter=openai_limiter,
+                        retry_budget=retries,
+                        max_chunk_tokens=chunk_tokens,
+                        model=model,
+                        screen_model=screen_model,
+                        screen_chunk_tokens=screen_chunk_tokens,
+                        finalists=finalists,
+                    )
         if not recommended_jobs:
             raise ValueError("No job recommendations received")
 
         logger.info(f"Received {len(recommended_jobs.jobs)} job recommendations")
+        logger.info(f"Used {retries.spent} of {retries.max_retries} retries")
 
         # Output results
         logger.info("\nRecommended jobs:")
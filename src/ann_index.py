@@ -0,0 +1,185 @@
+import json
+import math
+from typing import Optional
+
+import numpy as np
+
+from src.logger import logger
+from src.vector_index import VectorIndex, normalize, top_k_indices
+
+
+def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray, batch_size: int = 65536) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), batch_size):
+        batch = np.asarray(vectors[start : start + batch_size])
+        assignments[start : start + batch_size] = np.argmax(batch @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(
+    vectors: np.ndarray,
+    num_lists: int,
+    iterations: int = 10,
+    sample_size: int = 100000,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Train `num_lists` centroids with spherical k-means on a sample of normalized vectors.
+    """
+    rng = np.random.default_rng(seed)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False))])
+    centroids = sample[rng.choice(len(sample), num_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest_centroids(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        empty = np.bincount(assignments, minlength=num_lists) == 0
+        # Re-seed empty lists with random sample vectors so every list stays in use
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Approximate nearest-neighbour (inverted file) index on top of a VectorIndex.
+
+    Rows are assigned to the nearest of `num_lists` k-means centroids, and a search only scores the
+    rows of the `nprobe` lists whose centroids are closest to the query. `nprobe` trades recall for
+    latency; `num_lists` (by default about 4 * sqrt(rows)) sets how finely the corpus is partitioned.
+
+    The index is built incrementally: `update` assigns rows added to the vector index since the last
+    call, and the centroids are only retrained when the corpus has grown `retrain_factor` times since
+    they were trained. Centroids and row assignments are stored in `<vector index>/ivf/`.
+    Below `min_rows` rows, searches fall back to exact search.
+    """
+
+    def __init__(
+        self,
+        vectors: VectorIndex,
+        nprobe: int = 8,
+        num_lists: Optional[int] = None,
+        min_rows: int = 10000,
+        retrain_factor: float = 4.0,
+    ) -> None:
+        self.vectors = vectors
+        self.nprobe = nprobe
+        self.num_lists = num_lists
+        self.min_rows = min_rows
+        self.retrain_factor = retrain_factor
+
+        self.index_dir = vectors.index_dir / "ivf"
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.centroids_path = self.index_dir / "centroids.npy"
+        self.assignments_path = self.index_dir / "assignments.i32"
+        self.meta_path = self.index_dir / "meta.json"
+
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.trained_rows = 0
+        if self.centroids_path.exists() and self.meta_path.exists():
+            self.centroids = np.load(self.centroids_path)
+            self.trained_rows = json.loads(self.meta_path.read_text())["trained_rows"]
+            if self.assignments_path.exists():
+                self.assignments = np.fromfile(self.assignments_path, dtype=np.int32)[: len(vectors)]
+                if self.assignments_path.stat().st_size != self.assignments.nbytes:
+                    # Rows the vector index truncated after a crash are reused by new vectors,
+                    # so their stale assignments must not stay in the file for `update` to append after
+                    with open(self.assignments_path, "r+b") as f:
+                        f.truncate(self.assignments.nbytes)
+        self._build_lists()
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _build_lists(self) -> None:
+        # Rows sorted by list, with offsets, so probing a list is a contiguous slice
+        self._order = np.argsort(self.assignments, kind="stable")
+        num_lists = 0 if self.centroids is None else len(self.centroids)
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(self.assignments, minlength=num_lists))])
+
+    def train(self) -> None:
+        """
+        Train the centroids on the current corpus and reassign every row.
+        """
+        num_rows = len(self.vectors)
+        num_lists = self.num_lists or max(1, int(4 * math.sqrt(num_rows)))
+        logger.info(f"Training ANN index with {num_lists} lists on {num_rows} vectors")
+
+        self.centroids = train_centroids(self.vectors.matrix, num_lists)
+        self.assignments = _nearest_centroids(self.vectors.matrix, self.centroids)
+        self.trained_rows = num_rows
+
+        np.save(self.centroids_path, self.centroids)
+        self.assignments.tofile(self.assignments_path)
+        self.meta_path.write_text(json.dumps({"trained_rows": self.trained_rows}))
+        self._build_lists()
+
+    def update(self) -> None:
+        """
+        Bring the index up to date with the vector index, assigning new rows to their nearest list
+        and retraining once the corpus has outgrown the centroids.
+        """
+        num_rows = len(self.vectors)
+        if num_rows < self.min_rows:
+            return
+        if not self.is_trained or num_rows >= self.trained_rows * self.retrain_factor:
+            self.train()
+            return
+        if num_rows == len(self.assignments):
+            return
+
+        assert self.centroids is not None
+        new_assignments = _nearest_centroids(self.vectors.matrix[len(self.assignments) :], self.centroids)
+        with open(self.assignments_path, "ab") as f:
+            f.write(new_assignments.tobytes())
+        self.assignments = np.concatenate([self.assignments, new_assignments])
+        self._build_lists()
+
+    def search(
+        self,
+        query: np.ndarray,
+        k: int,
+        nprobe: Optional[int] = None,
+        allowed_rows: Optional[np.ndarray] = None,
+    ) -> list[tuple[int, float]]:
+        """
+        Return approximately the `k` rows most similar to the query as (row, score) pairs.
+        If `allowed_rows` is given, only those rows are returned.
+
+        At least `nprobe` lists are probed, and more lists are probed (nearest centroid first) until
+        `k` candidates are found, so a filter never shrinks the result below `k`. When the allowed
+        rows are fewer than the rows `nprobe` lists hold, they are simply searched exactly.
+        """
+        query = normalize(query)
+        allowed = None if allowed_rows is None else np.unique(allowed_rows)
+        nprobe = nprobe or self.nprobe
+        if not self.is_trained or len(self.assignments) < len(self.vectors):
+            # Not enough rows for an ANN index (or not updated yet): search exactly
+            candidates = np.arange(len(self.vectors)) if allowed is None else allowed
+        elif allowed is not None and len(allowed) * (len(self._offsets) - 1) <= nprobe * len(self.vectors):
+            # Scanning the allowed rows is no more work than probing the lists
+            candidates = allowed
+        else:
+            assert self.centroids is not None
+            is_allowed = None
+            if allowed is not None:
+                is_allowed = np.zeros(len(self.vectors), dtype=bool)
+                is_allowed[allowed] = True
+
+            parts: list[np.ndarray] = []
+            found = 0
+            for probed, i in enumerate(np.argsort(-(self.centroids @ query))):
+                if probed >= nprobe and found >= k:
+                    break
+                members = self._order[self._offsets[i] : self._offsets[i + 1]]
+                if is_allowed is not None:
+                    members = members[is_allowed[members]]
+                parts.append(members)
+                found += len(members)
+            candidates = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+        candidates = np.sort(candidates)
+        scores = np.asarray(self.vectors.matrix[candidates]) @ query
+        return [(int(candidates[i]), float(scores[i])) for i in top_k_indices(scores, k)]
@@ -1,11 +1,14 @@
+import asyncio
 import os
-import time
-from collections import deque
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Optional
 
+import httpx
 from firecrawl import FirecrawlApp  # type: ignore
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from src.logger import logger
+if TYPE_CHECKING:
+    from src.retry import RetryBudget
 
 
 def initialize_api_clients() -> tuple[FirecrawlApp, OpenAI]:
@@ -18,22 +21,168 @@ def initialize_api_clients() -> tuple[FirecrawlApp, OpenAI]:
     if not firecrawl_api_key or not openai_api_key:
         raise ValueError("Missing required API keys in environment variables")
 
-    return FirecrawlApp(api_key=firecrawl_api_key), OpenAI(api_key=openai_api_key)
+    # Retries are handled by src.retry, so the OpenAI client's own retries are disabled
+    return FirecrawlApp(api_key=firecrawl_api_key), OpenAI(api_key=openai_api_key, max_retries=0)
 
 
-def wait_for_rate_limit(request_timestamps: deque[float], rate_limit: int, window_size: int) -> None:
+def async_openai_client(openai: OpenAI) -> AsyncOpenAI:
     """
-    Ensure the rate limit is not exceeded by waiting if necessary.
+    Create an AsyncOpenAI client with the same credentials and settings as a synchronous client.
+    Async clients are bound to the event loop they are used in, so one is created per run.
     """
-    current_time = time.time()
+    return AsyncOpenAI(api_key=openai.api_key, base_url=openai.base_url, max_retries=openai.max_retries)
 
-    # Remove timestamps older than our window
-    while request_timestamps and request_timestamps[0] < current_time - window_size:
-        request_timestamps.popleft()
 
-    # If we're at the rate limit, wait until the oldest request expires
-    if len(request_timestamps) >= rate_limit:
-        sleep_time = request_timestamps[0] - (current_time - window_size) + 0.1  # Add 0.1s buffer
-        if sleep_time > 0:
-            logger.info(f"Rate limit reached. Waiting {sleep_time:.1f} seconds...")
-            time.sleep(sleep_time)
+class FirecrawlAPIError(Exception):
+    """
+    Error returned by the Firecrawl API, carrying the HTTP status code and any `Retry-After` delay.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a `Retry-After` header given in seconds. HTTP-date values are ignored.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+class AsyncFirecrawlClient:
+    """
+    Native async client for the Firecrawl endpoints used by the pipeline.
+
+    A single client is meant to live for a whole run: all requests share one keep-alive
+    connection pool (HTTP/2 when the `h2` package is available), so concurrent extractions
+    neither spawn threads nor pay a fresh TCP/TLS handshake per link.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = "https://api.firecrawl.dev",
+        max_connections: int = 100,
+        poll_interval: float = 2.0,
+        poll_attempts: int = 5,
+        extract_timeout: float = 600.0,
+        timeout: float = 60.0,
+        retry_budget: Optional["RetryBudget"] = None,
+    ) -> None:
+        self.api_url = api_url.rstrip("/")
+        self.poll_interval = poll_interval
+        self.poll_attempts = poll_attempts
+        self.extract_timeout = extract_timeout
+        # Status poll retries draw from the run's retry budget like every other retry
+        self.retry_budget = retry_budget
+        self._client = httpx.AsyncClient(
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+            },
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+        )
+
+    @classmethod
+    def from_app(cls, firecrawl: FirecrawlApp, **kwargs: Any) -> "AsyncFirecrawlClient":
+        """
+        Create an async client with the same credentials and API URL as a FirecrawlApp.
+        """
+        return cls(firecrawl.api_key, firecrawl.api_url, **kwargs)
+
+    async def __aenter__(self) -> "AsyncFirecrawlClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _request(self, method: str, endpoint: str, json: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        response = await self._client.request(method, f"{self.api_url}{endpoint}", json=json)
+        if response.status_code != 200:
+            try:
+                error = response.json().get("error", response.text)
+            except ValueError:
+                error = response.text
+            raise FirecrawlAPIError(
+                f"Firecrawl {method} {endpoint} failed with status code {response.status_code}: {error}",
+                status_code=response.status_code,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+            )
+
+        try:
+            return response.json()
+        except ValueError:
+            raise FirecrawlAPIError(f"Failed to parse Firecrawl response from {endpoint} as JSON")
+
+    async def scrape_url(self, url: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """
+        Scrape a single URL and return the scraped data, like `FirecrawlApp.scrape_url`.
+        """
+        response = await self._request("POST", "/v1/scrape", {"url": url, **(params or {})})
+        if not response.get("success") or "data" not in response:
+            raise FirecrawlAPIError(f"Failed to scrape {url}. Error: {response.get('error', response)}")
+        return response["data"]
+
+    async def extract(self, urls: list[str], params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Start an extract job and poll it until it completes, like `FirecrawlApp.extract`.
+        Returns the final status payload, which holds `success` and the extracted `data`.
+
+        Status polls are retried here, so a transient poll failure never makes the caller start
+        (and pay for) a second extract job. Failures after the job has started, and jobs still not
+        done after `extract_timeout` seconds, raise a non-retryable FirecrawlAPIError.
+        """
+        response = await self._request("POST", "/v1/extract", {"urls": urls, "origin": "api-sdk", **params})
+        if not response.get("success"):
+            raise FirecrawlAPIError(f"Failed to start extract job. Error: {response.get('error', response)}")
+
+        job_id = response.get("id")
+        if not job_id:
+            raise FirecrawlAPIError("Job ID not returned from extract request")
+
+        try:
+            async with asyncio.timeout(self.extract_timeout):
+                return await self._poll_extract(job_id)
+        except TimeoutError:
+            raise FirecrawlAPIError(f"Extract job {job_id} did not complete within {self.extract_timeout:g}s")
+
+    async def _poll_extract(self, job_id: str) -> dict[str, Any]:
+        # src.retry imports this module for FirecrawlAPIError, so it is imported lazily here
+        from src.retry import retry_async
+
+        while True:
+            try:
+                status = await retry_async(
+                    lambda: self._request("GET", f"/v1/extract/{job_id}"),
+                    f"status poll of extract job {job_id}",
+                    self.retry_budget,
+                    max_attempts=self.poll_attempts,
+                    base_delay=self.poll_interval,
+                )
+            except FirecrawlAPIError as e:
+                raise FirecrawlAPIError(f"Polling extract job {job_id} failed: {e}")
+            except httpx.TransportError as e:
+                raise FirecrawlAPIError(f"Polling extract job {job_id} failed: {e!r}")
+
+            if status.get("status") == "completed":
+                return status
+            if status.get("status") in ("failed", "cancelled"):
+                raise FirecrawlAPIError(f"Extract job {status['status']}. Error: {status.get('error')}")
+            await asyncio.sleep(self.poll_interval)
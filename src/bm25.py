@@ -0,0 +1,134 @@
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from src.types import JobSchema
+from src.vector_index import top_k_indices
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or our the to we with you your".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase terms, keeping characters that matter in skill names (c++, c#, node.js).
+    """
+    tokens = (token.rstrip(".") for token in re.findall(r"[a-z0-9][a-z0-9+#.]*", text.lower()))
+    return [token for token in tokens if token and token not in STOPWORDS]
+
+
+def skill_terms(job: JobSchema) -> list[str]:
+    """
+    Return the terms of every key skill of a job, and every multi-word skill as a single
+    phrase term (e.g. "machine learning").
+    """
+    terms: list[str] = []
+    for skill in job.key_skills:
+        tokens = tokenize(skill)
+        terms.extend(tokens)
+        if len(tokens) > 1:
+            terms.append(" ".join(tokens))
+    return terms
+
+
+def job_terms(job: JobSchema) -> list[str]:
+    """
+    Return the indexed terms of a job: its title terms and its skill terms.
+    """
+    return tokenize(job.job_title) + skill_terms(job)
+
+
+class ResumeMatcher:
+    """
+    Fast local relevance score of a job (or any list of terms) against a resume: the percentage of
+    the distinct terms that occur in the resume, including multi-word skill phrases.
+    Unlike BM25 it needs no corpus statistics, so it can score jobs one at a time as they arrive.
+    """
+
+    def __init__(self, resume: str) -> None:
+        tokens = tokenize(resume)
+        self.tokens = set(tokens)
+        self.text = f" {' '.join(tokens)} "
+
+    def matches(self, term: str) -> bool:
+        return f" {term} " in self.text if " " in term else term in self.tokens
+
+    def score(self, terms: list[str]) -> float:
+        """
+        Return the percentage (0 to 100) of the distinct terms found in the resume.
+        """
+        distinct = set(terms)
+        if not distinct:
+            return 0.0
+        return 100 * sum(self.matches(term) for term in distinct) / len(distinct)
+
+    def score_job(self, job: JobSchema) -> float:
+        return self.score(job_terms(job))
+
+
+class BM25Index:
+    """
+    In-memory inverted index from normalized skill and title terms to jobs, scored with BM25.
+
+    The per-posting BM25 weights of every term are computed once when the index is built, so
+    scoring a resume is a sum of a few array additions, one per resume term found in the index.
+    Resume terms are counted once, so long resumes are not biased towards repeated words.
+    """
+
+    def __init__(self, jobs: list[JobSchema], k1: float = 1.5, b: float = 0.75) -> None:
+        self.jobs = jobs
+        documents = [Counter(job_terms(job)) for job in jobs]
+        lengths = np.array([sum(document.values()) for document in documents], dtype=np.float32)
+        average_length = float(lengths.mean()) if len(jobs) and lengths.mean() > 0 else 1.0
+        length_norms = k1 * (1 - b + b * lengths / average_length)
+
+        postings: dict[str, list[tuple[int, int]]] = {}
+        for position, document in enumerate(documents):
+            for term, frequency in document.items():
+                postings.setdefault(term, []).append((position, frequency))
+
+        self.postings: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for term, entries in postings.items():
+            positions = np.array([position for position, _ in entries])
+            frequencies = np.array([frequency for _, frequency in entries], dtype=np.float32)
+            idf = math.log(1 + (len(jobs) - len(entries) + 0.5) / (len(entries) + 0.5))
+            weights = idf * frequencies * (k1 + 1) / (frequencies + length_norms[positions])
+            self.postings[term] = (positions, weights)
+        self.phrases = [term for term in self.postings if " " in term]
+
+    def query_terms(self, text: str) -> list[str]:
+        """
+        Return the distinct indexed terms that occur in the text, including skill phrases.
+        """
+        tokens = tokenize(text)
+        joined = f" {' '.join(tokens)} "
+        terms = {token for token in tokens if token in self.postings}
+        terms.update(phrase for phrase in self.phrases if f" {phrase} " in joined)
+        return sorted(terms)
+
+    def scores(self, text: str) -> np.ndarray:
+        """
+        Return the BM25 score of every job against the text.
+        """
+        scores = np.zeros(len(self.jobs), dtype=np.float32)
+        for term in self.query_terms(text):
+            positions, weights = self.postings[term]
+            scores[positions] += weights
+        return scores
+
+    def search(self, text: str, k: int) -> list[tuple[int, float]]:
+        """
+        Return the `k` best matching jobs as (position, score) pairs, best first.
+        """
+        scores = self.scores(text)
+        return [(int(i), float(scores[i])) for i in top_k_indices(scores, k)]
+
+    def matched_terms(self, text: str, position: int) -> list[str]:
+        """
+        Return the terms of the text that matched the job at `position`.
+        """
+        terms = set(job_terms(self.jobs[position]))
+        return [term for term in self.query_terms(text) if term in terms]
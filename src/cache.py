@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from src.logger import logger
+from src.types import JobSchema, JobScore, Recommendations
+
+
+def hash_text(text: str) -> str:
+    """
+    Return a stable hex digest for the given text, used to build cache keys and file names.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def fingerprint_job(job: JobSchema) -> str:
+    """
+    Return a fingerprint of a single job's content.
+    """
+    return hash_text(json.dumps(job.model_dump(include=set(JobSchema.model_fields)), sort_keys=True))
+
+
+def fingerprint_jobs(jobs: list[JobSchema]) -> str:
+    """
+    Return a fingerprint of a job corpus that does not depend on the order the jobs were extracted in.
+    """
+    return hash_text("\n".join(sorted(json.dumps(job.model_dump(), sort_keys=True) for job in jobs)))
+
+
+class ExtractionCache:
+    """
+    Durable per-link cache of extracted job data.
+
+    Every apply link is stored in its own JSON file under `<cache_dir>/<version>/`, so adding new
+    postings to a run only pays for the links that have never been extracted, and changing the
+    extraction prompt or schema (and therefore the version) starts from a clean cache.
+    """
+
+    def __init__(self, cache_dir: Path, version: str) -> None:
+        self.root_dir = Path(cache_dir)
+        self.version = version
+        self.cache_dir = self.root_dir / version
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def for_source(self, source: str) -> "ExtractionCache":
+        """
+        Return a cache for jobs built by another source than LLM extraction (e.g. structured data),
+        stored apart from the extracted jobs so they are never served when that source is disabled.
+        """
+        return ExtractionCache(self.root_dir, f"{self.version}-{source}")
+
+    def _path(self, link: str) -> Path:
+        return self.cache_dir / f"{hash_text(link)}.json"
+
+    def __contains__(self, link: str) -> bool:
+        return self._path(link).exists()
+
+    def get(self, link: str) -> Optional[JobSchema]:
+        """
+        Return the cached job for a link, or None if it has not been extracted yet.
+        """
+        path = self._path(link)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return JobSchema(**json.load(f)["job"])
+        except Exception:
+            # A corrupt entry is treated as a miss and overwritten on the next extraction
+            logger.warning(f"Ignoring unreadable cache entry for {link}")
+            return None
+
+    def set(self, link: str, job: JobSchema) -> None:
+        """
+        Store the extracted job for a link. Writes go through a temporary file so an interrupted
+        run never leaves a half-written entry behind.
+        """
+        path = self._path(link)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"link": link, "job": job.model_dump()}, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(path)
+
+
+class RecommendationCache:
+    """
+    Content-addressed cache of job recommendations.
+
+    Entries are keyed by a hash of everything that determines the result (resume, job corpus,
+    number of recommendations, model and prompt version) and kept side by side in `cache_dir`,
+    so switching between resumes or settings is a cache hit instead of a fresh ranking.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(**params: Any) -> str:
+        """
+        Build a cache key from the parameters of a ranking run.
+        """
+        return hash_text(json.dumps(params, sort_keys=True))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Recommendations]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return Recommendations(**json.load(f))
+        except Exception:
+            # If the file is empty or invalid, we will rerun the ranking
+            logger.warning(f"Ignoring unreadable recommendations cache entry {path}")
+            return None
+
+    def set(self, key: str, recommendations: Recommendations, metadata: dict[str, Any]) -> None:
+        """
+        Store recommendations along with a description of the run they belong to.
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"metadata": metadata, "jobs": [job.model_dump() for job in recommendations.jobs]},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+        tmp_path.replace(path)
+
+
+class ScoreCache:
+    """
+    Append-only JSONL store of pointwise fit scores for one resume, model and prompt version.
+
+    Each line maps a job fingerprint to its score, so a rerun over a corpus with a few new postings
+    only has to score those postings.
+    """
+
+    def __init__(self, cache_dir: Path, key: str) -> None:
+        self.path = Path(cache_dir) / f"{key}.jsonl"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def load(self) -> dict[str, JobScore]:
+        """
+        Return the stored scores keyed by job fingerprint. Unreadable lines are skipped.
+        """
+        scores: dict[str, JobScore] = {}
+        if not self.path.exists():
+            return scores
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    scores[record["job"]] = JobScore(**record["score"])
+                except Exception:
+                    logger.warning(f"Skipping unreadable score line {line_number} in {self.path}")
+
+        return scores
+
+    def append(self, job_fingerprint: str, score: JobScore) -> None:
+        """
+        Append a job's score and flush it to disk.
+        """
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"job": job_fingerprint, "score": score.model_dump()}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,55 @@
+import json
+import os
+from pathlib import Path
+
+from src.logger import logger
+from src.types import JobSchema
+
+
+class ExtractionCheckpoint:
+    """
+    Append-only JSONL checkpoint of the jobs extracted during a run.
+
+    Each line holds one `{"link": ..., "job": {...}}` record and is flushed to disk as soon as the
+    job is extracted, so a run that is interrupted can be resumed without losing paid extractions.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def reset(self) -> None:
+        """
+        Start a fresh checkpoint, discarding the records of any previous run.
+        """
+        self.path.write_text("", encoding="utf-8")
+
+    def load(self) -> dict[str, JobSchema]:
+        """
+        Replay the checkpoint and return the extracted jobs keyed by the link they were extracted from.
+        A partially written last line (e.g. from a crash mid-write) is skipped.
+        """
+        completed: dict[str, JobSchema] = {}
+        if not self.path.exists():
+            return completed
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    completed[record["link"]] = JobSchema(**record["job"])
+                except Exception:
+                    logger.warning(f"Skipping unreadable checkpoint line {line_number} in {self.path}")
+
+        return completed
+
+    def append(self, link: str, job: JobSchema) -> None:
+        """
+        Append an extracted job to the checkpoint and flush it to disk.
+        """
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"link": link, "job": job.model_dump()}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from src.api import FirecrawlAPIError
+from src.logger import logger
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """
+    Return True for errors that signal the provider is overloaded: 429s, 5xx responses and timeouts.
+    """
+    if isinstance(exc, FirecrawlAPIError):
+        return exc.status_code is not None and (exc.status_code == 429 or exc.status_code >= 500)
+    return isinstance(exc, (httpx.TimeoutException, asyncio.TimeoutError))
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) concurrency limiter.
+
+    Works like a semaphore whose size is adjusted from the outcome of each request: after a full
+    window of successful requests with latency close to the best latency seen so far, the limit grows
+    by one; on a 429, 5xx or timeout it is multiplied by `decrease_factor`. Decreases are spaced by at
+    least one smoothed latency (and `min_decrease_interval`), so a burst of failures from requests
+    that were already in flight only backs off once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 5,
+        min_limit: int = 1,
+        max_limit: int = 50,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        min_decrease_interval: float = 1.0,
+    ) -> None:
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= max_limit")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = min(max(initial_limit, min_limit), max_limit)
+        self.peak_limit = self.limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.min_decrease_interval = min_decrease_interval
+
+        self.in_flight = 0
+        self.smoothed_latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self._successes_since_change = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one concurrency slot for the duration of the block.
+        """
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a successful request and grow the limit if latency has stayed flat for a full window.
+        """
+        if self.smoothed_latency is None:
+            self.smoothed_latency = latency
+        else:
+            self.smoothed_latency += self.smoothing * (latency - self.smoothed_latency)
+        if self.baseline_latency is None or self.smoothed_latency < self.baseline_latency:
+            self.baseline_latency = self.smoothed_latency
+
+        self._successes_since_change += 1
+        if self._successes_since_change < self.limit:
+            return
+
+        self._successes_since_change = 0
+        if self.smoothed_latency <= self.baseline_latency * self.latency_tolerance and self.limit < self.max_limit:
+            self._set_limit(self.limit + 1)
+
+    def record_overload(self) -> None:
+        """
+        Record a 429, 5xx or timeout and back off multiplicatively.
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < max(self.smoothed_latency or 0.0, self.min_decrease_interval):
+            return
+
+        self._last_decrease = now
+        self._successes_since_change = 0
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit != self.limit:
+            logger.info(f"Provider is overloaded, reducing concurrency from {self.limit} to {new_limit}")
+            self._set_limit(new_limit)
+
+    def _set_limit(self, limit: int) -> None:
+        self.limit = limit
+        self.peak_limit = max(self.peak_limit, limit)
@@ -0,0 +1,91 @@
+import heapq
+from typing import Optional
+
+from src.bm25 import ResumeMatcher, skill_terms, tokenize
+from src.logger import logger
+from src.types import JobListing, JobSchema
+
+
+class EarlyStopPolicy:
+    """
+    Decides when extraction can stop because the remaining postings are unlikely to change the top-N.
+
+    Every extracted job gets a local score against the resume: the average of its title/division
+    match and its skill match. Extraction stops when
+    - the running top-N by that score has not changed for `patience` extractions, or
+    - with `use_bounds`, no remaining posting can beat the current N-th place. A posting's upper
+      bound assumes its skills all match the resume, so it is bounded by its listing title and team.
+      Listings without a title or team are never ruled out.
+    """
+
+    def __init__(
+        self,
+        resume: str,
+        num_recommendations: int,
+        listings: Optional[list[JobListing]] = None,
+        patience: int = 0,
+        use_bounds: bool = True,
+    ) -> None:
+        self.matcher = ResumeMatcher(resume)
+        self.num_recommendations = num_recommendations
+        self.patience = patience
+        self.use_bounds = use_bounds
+        self.listing_bounds = {listing.apply_link: self.upper_bound(listing) for listing in listings or []}
+
+        self.top: list[tuple[float, str]] = []
+        self.stable = 0
+        self.remaining: set[str] = set()
+        self.bounds: list[tuple[float, str]] = []
+        self.stop_reason: Optional[str] = None
+
+    def score_job(self, job: JobSchema) -> float:
+        title_score = self.matcher.score(tokenize(f"{job.job_title} {job.sub_division_of_organization}"))
+        return (title_score + self.matcher.score(skill_terms(job))) / 2
+
+    def upper_bound(self, listing: JobListing) -> float:
+        if not listing.title and not listing.team:
+            return 100.0
+        return (self.matcher.score(tokenize(f"{listing.title} {listing.team}")) + 100) / 2
+
+    def track(self, links: list[str]) -> None:
+        """
+        Set the links that are still to be extracted.
+        """
+        self.remaining = set(links)
+        self.bounds = [(-self.listing_bounds.get(link, 100.0), link) for link in self.remaining]
+        heapq.heapify(self.bounds)
+
+    def observe(self, link: str, job: Optional[JobSchema]) -> bool:
+        """
+        Record the outcome of one extraction (None if it failed). Returns True when extraction should stop.
+        """
+        self.remaining.discard(link)
+        if job is not None:
+            score = self.score_job(job)
+            if len(self.top) < self.num_recommendations:
+                heapq.heappush(self.top, (score, link))
+                self.stable = 0
+            elif score > self.top[0][0]:
+                heapq.heapreplace(self.top, (score, link))
+                self.stable = 0
+            else:
+                self.stable += 1
+
+        if len(self.top) < self.num_recommendations:
+            return False
+
+        if self.patience and self.stable >= self.patience:
+            self.stop_reason = f"the top {self.num_recommendations} has not changed for {self.stable} extractions"
+        elif self.use_bounds:
+            while self.bounds and self.bounds[0][1] not in self.remaining:
+                heapq.heappop(self.bounds)
+            if self.bounds and -self.bounds[0][0] <= self.top[0][0]:
+                self.stop_reason = (
+                    f"no remaining posting can score above {self.top[0][0]:.0f} "
+                    f"(best possible {-self.bounds[0][0]:.0f})"
+                )
+
+        if self.stop_reason and self.remaining:
+            logger.info(f"Stopping extraction early with {len(self.remaining)} links left: {self.stop_reason}")
+            return True
+        return False
@@ -0,0 +1,66 @@
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+from openai import OpenAI
+
+from src.cache import hash_text
+from src.rate_limit import RateLimiter
+from src.retry import RetryBudget, retry_sync
+from src.types import JobSchema
+from src.vector_index import VectorIndex
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def job_embedding_text(job: JobSchema) -> str:
+    """
+    Return the text a job is embedded from: its title, division and key skills.
+    """
+    return f"{job.job_title}\n{job.sub_division_of_organization}\n{', '.join(job.key_skills)}"
+
+
+def embedding_key(text: str) -> str:
+    return hash_text(text)
+
+
+class EmbeddingStore:
+    """
+    On-disk embedding cache backed by persistent vector indexes, one for job records and one for
+    queries (resumes), so every text is only embedded once across runs and job searches never
+    include resumes.
+    """
+
+    def __init__(self, cache_dir: Path, model: str = EMBEDDING_MODEL) -> None:
+        self.model = model
+        self.jobs = VectorIndex(Path(cache_dir) / model / "jobs")
+        self.queries = VectorIndex(Path(cache_dir) / model / "queries")
+
+    def embed(
+        self,
+        openai: OpenAI,
+        index: VectorIndex,
+        texts: list[str],
+        batch_size: int = 256,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ) -> list[str]:
+        """
+        Make sure every text is in `index`, only calling the API for texts that are not stored yet.
+        Returns the index keys of the texts, in order.
+        """
+        keys = [embedding_key(text) for text in texts]
+        missing = list({key: text for key, text in zip(keys, texts) if key not in index}.items())
+
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start : start + batch_size]
+
+            def create() -> Any:
+                if rate_limiter:
+                    rate_limiter.acquire_sync()
+                return openai.embeddings.create(model=self.model, input=[text for _, text in batch])
+
+            response = retry_sync(create, f"embedding of {len(batch)} texts", retry_budget)
+            index.add([key for key, _ in batch], np.array([item.embedding for item in response.data]))
+
+        return keys
@@ -0,0 +1,128 @@
+from functools import lru_cache
+from typing import Optional
+
+import tiktoken
+
+from src.logger import logger
+from src.types import JobSchema
+
+JOB_TABLE_COLUMNS = "id | title | division | location | compensation | key skills"
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    try:
+        encoding_name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        encoding_name = "o200k_base"
+
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        # The encoding files are downloaded on first use; fall back to an estimate when offline
+        logger.warning(f"Could not load the tokenizer for {model}, estimating token counts instead")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """
+    Count the tokens of a text with the model's tokenizer.
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _cell(value: str) -> str:
+    return " ".join(value.replace("|", "/").split())
+
+
+class JobTableEncoder:
+    """
+    Compact, token-efficient encoding of job listings for LLM prompts.
+
+    Jobs become rows of a pipe-separated table with short numeric IDs, and divisions and locations,
+    which repeat across most postings of a company, are listed once in a legend and referenced by
+    codes like `D1` or `L2`. Compared to indented JSON this avoids repeating every key name and every
+    repeated value for each job.
+    """
+
+    def __init__(self) -> None:
+        self.divisions: dict[str, str] = {}
+        self.locations: dict[str, str] = {}
+        self.rows: list[str] = []
+
+    @staticmethod
+    def _code(values: dict[str, str], prefix: str, value: str, new_lines: list[str]) -> str:
+        value = _cell(value)
+        if not value:
+            return ""
+        if value not in values:
+            values[value] = f"{prefix}{len(values) + 1}"
+            new_lines.append(f"{values[value]}: {value}")
+        return values[value]
+
+    def add(self, job: JobSchema) -> list[str]:
+        """
+        Add a job as the next row, using its position as its ID.
+        Returns the lines this adds to the encoded table: the row and any new legend entries.
+        """
+        new_lines: list[str] = []
+        row = " | ".join(
+            [
+                str(len(self.rows)),
+                _cell(job.job_title),
+                self._code(self.divisions, "D", job.sub_division_of_organization, new_lines),
+                self._code(self.locations, "L", job.location, new_lines),
+                _cell(job.compensation),
+                "; ".join(_cell(skill) for skill in job.key_skills),
+            ]
+        )
+        self.rows.append(row)
+        return [row, *new_lines]
+
+    def encode(self) -> str:
+        lines = ["Divisions:"]
+        lines += [f"{code}: {value}" for value, code in self.divisions.items()]
+        lines += ["Locations:"]
+        lines += [f"{code}: {value}" for value, code in self.locations.items()]
+        lines += [f"Jobs ({JOB_TABLE_COLUMNS}):"]
+        lines += self.rows
+        return "\n".join(lines)
+
+
+def encode_jobs(jobs: list[JobSchema]) -> str:
+    """
+    Encode job listings as a compact table. A job's ID is its position in `jobs`.
+    """
+    encoder = JobTableEncoder()
+    for job in jobs:
+        encoder.add(job)
+    return encoder.encode()
+
+
+def chunk_jobs(jobs: list[JobSchema], max_tokens: int, model: str = "gpt-4o") -> list[list[JobSchema]]:
+    """
+    Split jobs into consecutive chunks whose encoded table stays within `max_tokens`,
+    counting each row and each new legend entry with the model's tokenizer.
+    """
+    header_tokens = count_tokens(JobTableEncoder().encode(), model)
+
+    chunks: list[list[JobSchema]] = []
+    chunk: list[JobSchema] = []
+    encoder = JobTableEncoder()
+    chunk_tokens = header_tokens
+    for job in jobs:
+        job_tokens = count_tokens("\n".join(encoder.add(job)), model) + 1
+        if chunk and chunk_tokens + job_tokens > max_tokens:
+            chunks.append(chunk)
+            chunk, encoder = [], JobTableEncoder()
+            job_tokens = count_tokens("\n".join(encoder.add(job)), model) + 1
+            chunk_tokens = header_tokens
+
+        chunk.append(job)
+        chunk_tokens += job_tokens
+    if chunk:
+        chunks.append(chunk)
+    return chunks
@@ -0,0 +1,125 @@
+import re
+from html.parser import HTMLParser
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+
+from src.links import canonicalize_link, posting_key
+from src.types import JobListing
+
+# URL paths that usually hold a single job posting
+DEFAULT_LINK_PATTERNS = [
+    r"/jobs?/[^/?#]+",
+    r"/careers?/[^?#]*[^/?#]+",
+    r"/positions?/[^/?#]+",
+    r"/openings?/[^/?#]+",
+    r"/roles?/[^/?#]+",
+    r"/vacanc(?:y|ies)/[^/?#]+",
+    r"[?&]gh_jid=\d+",
+]
+CHROME_TAGS = frozenset({"nav", "header", "footer"})
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+VOID_TAGS = frozenset({"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"})
+
+
+class _Anchor:
+    def __init__(self, href: str, container: tuple[str, ...], team: str, in_chrome: bool) -> None:
+        self.href = href
+        self.container = container
+        self.team = team
+        self.in_chrome = in_chrome
+        self.text: list[str] = []
+
+
+class _AnchorParser(HTMLParser):
+    """
+    Collects every anchor with its text, the nearest preceding heading, whether it sits in page chrome
+    (nav, header, footer), and the tag/class path of its container, which repeats for every row of a listing.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stack: list[str] = []
+        self.anchors: list[_Anchor] = []
+        self.heading = ""
+        self._heading_text: Optional[list[str]] = None
+        self._anchor: Optional[_Anchor] = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag in VOID_TAGS:
+            return
+        attributes = {name: value or "" for name, value in attrs}
+        if tag == "a" and attributes.get("href"):
+            chrome = any(element.split(".")[0] in CHROME_TAGS for element in self.stack)
+            self._anchor = _Anchor(attributes["href"], tuple(self.stack[-4:]), self.heading, chrome)
+        elif tag in HEADING_TAGS and self._anchor is None:
+            self._heading_text = []
+        classes = ".".join(sorted(attributes.get("class", "").split()))
+        self.stack.append(f"{tag}.{classes}" if classes else tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in VOID_TAGS:
+            return
+        if tag == "a" and self._anchor:
+            self.anchors.append(self._anchor)
+            self._anchor = None
+        elif tag in HEADING_TAGS and self._heading_text is not None:
+            self.heading = " ".join("".join(self._heading_text).split())
+            self._heading_text = None
+        # Tolerate unclosed tags by popping up to the matching start tag
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth].split(".")[0] == tag:
+                del self.stack[depth:]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._anchor:
+            self._anchor.text.append(data)
+        if self._heading_text is not None:
+            self._heading_text.append(data)
+
+
+def _is_posting_link(url: str, patterns: list[re.Pattern]) -> bool:
+    return posting_key(url) != canonicalize_link(url) or any(pattern.search(url) for pattern in patterns)
+
+
+def discover_job_links(page_html: str, page_url: str, link_patterns: Optional[list[str]] = None) -> list[JobListing]:
+    """
+    Find the job posting links of a jobs page locally, without an LLM.
+
+    With `link_patterns`, every link whose absolute URL matches one of the regular expressions is a job.
+    Otherwise, links outside the page chrome that point to a known ATS posting or match the default job
+    URL patterns are candidates, and only the candidates in the page's repeated listing structure are kept:
+    container paths shared by at least two links and at least a quarter as common as the most common one.
+    A page without such a structure (e.g. a single stray careers link) yields no listings, so the caller
+    falls back to the LLM scrape.
+    The anchor text becomes the listing title and the nearest preceding heading its team.
+    """
+    parser = _AnchorParser()
+    parser.feed(page_html)
+
+    page_key = canonicalize_link(page_url)
+    patterns = [re.compile(pattern) for pattern in (link_patterns or DEFAULT_LINK_PATTERNS)]
+    candidates: list[tuple[str, _Anchor]] = []
+    for anchor in parser.anchors:
+        url = urljoin(page_url, anchor.href.strip())
+        if urlsplit(url).scheme not in ("http", "https") or canonicalize_link(url) == page_key:
+            continue
+        if link_patterns:
+            if any(pattern.search(url) for pattern in patterns):
+                candidates.append((url, anchor))
+        elif not anchor.in_chrome and _is_posting_link(url, patterns):
+            candidates.append((url, anchor))
+
+    if not link_patterns and candidates:
+        container_counts: dict[tuple[str, ...], int] = {}
+        for _, anchor in candidates:
+            container_counts[anchor.container] = container_counts.get(anchor.container, 0) + 1
+        largest = max(container_counts.values())
+        threshold = max(2, largest / 4)
+        candidates = [(url, anchor) for url, anchor in candidates if container_counts[anchor.container] >= threshold]
+
+    listings: dict[str, JobListing] = {}
+    for url, anchor in candidates:
+        title = " ".join(" ".join(anchor.text).split())
+        listings.setdefault(posting_key(url), JobListing(apply_link=url, title=title, team=anchor.team))
+    return list(listings.values())
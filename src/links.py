@@ -0,0 +1,56 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a visitor came from and never change the posting
+TRACKING_PARAMS = frozenset(
+    {"gh_src", "lever-source", "lever-origin", "ashby_src", "source", "src", "ref", "referrer", "trk", "fbclid", "gclid"}
+)
+
+# Known applicant tracking system URL patterns, resolved to a stable posting ID
+ATS_PATTERNS = [
+    ("greenhouse", re.compile(r"^(?:job-)?boards(?:\.eu)?\.greenhouse\.io$"), re.compile(r"^/[^/]+/jobs/(\d+)")),
+    ("lever", re.compile(r"^jobs(?:\.eu)?\.lever\.co$"), re.compile(r"^/[^/]+/([0-9a-f-]{36})", re.IGNORECASE)),
+    ("ashby", re.compile(r"^jobs\.ashbyhq\.com$"), re.compile(r"^/[^/]+/([0-9a-f-]{36})", re.IGNORECASE)),
+]
+
+
+def canonicalize_link(link: str) -> str:
+    """
+    Normalize an apply link: lowercase scheme and host, drop `www.`, default ports, fragments,
+    tracking parameters (utm_*, gh_src, ...) and trailing slashes, and sort the remaining query parameters.
+    """
+    parts = urlsplit(link.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def posting_key(link: str) -> str:
+    """
+    Return the identity of the posting an apply link points to. Links of known ATS boards (Greenhouse,
+    Lever, Ashby) resolve to the ATS posting ID, so a posting's detail page and its application form,
+    or a company page embedding a Greenhouse job (`?gh_jid=`), are the same posting.
+    Other links are identified by their canonical form.
+    """
+    canonical = canonicalize_link(link)
+    parts = urlsplit(canonical)
+    query = dict(parse_qsl(parts.query))
+    if "gh_jid" in query:
+        return f"greenhouse:{query['gh_jid']}"
+    if parts.path.endswith("/embed/job_app") and "token" in query:
+        return f"greenhouse:{query['token']}"
+    for ats, host_pattern, path_pattern in ATS_PATTERNS:
+        if host_pattern.match(parts.netloc) and (match := path_pattern.match(parts.path)):
+            return f"{ats}:{match.group(1).lower()}"
+    return canonical
+
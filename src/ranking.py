@@ -0,0 +1,260 @@
+import asyncio
+import json
+import math
+from typing import Any, Optional
+
+from openai import AsyncOpenAI
+
+from src.cache import hash_text
+from src.job_encoding import chunk_jobs, count_tokens, encode_jobs
+from src.logger import logger
+from src.rate_limit import RateLimiter
+from src.retry import RetryBudget, retry_async
+from src.types import JobRankings, JobSchema, JobScore, RecommendedJob
+
+
+def ranking_prompt_version() -> str:
+    """
+    Return a short fingerprint of the ranking prompt template and response format.
+    Cached recommendations are only reused while this fingerprint stays the same.
+    """
+    schema = json.dumps(JobRankings.model_json_schema(), sort_keys=True)
+    return hash_text(f"{build_ranking_prompt('', [], 0)}\n{schema}")[:12]
+
+
+def build_ranking_prompt(resume: str, jobs: list[JobSchema], num_recommendations: int) -> str:
+    return f"""
+    <instructions>
+    Analyze the resume and job listings, and return the top {num_recommendations} roles that best fit the candidate's experience and skills, best first.
+    The job listings are a table with one job per row. Division and location codes refer to the legend above the table.
+    For each role, return only its id from the table, a fit score from 0 to 100, and a one-sentence reason.
+    </instructions>
+
+    <resume>
+    {resume}
+    </resume>
+
+    <job_listings>
+    {encode_jobs(jobs)}
+    </job_listings>
+    """
+
+
+async def rank_chunk(
+    client: AsyncOpenAI,
+    resume: str,
+    jobs: list[JobSchema],
+    num_recommendations: int,
+    model: str = "gpt-4o",
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+) -> list[RecommendedJob]:
+    """
+    Ask the model for the top `num_recommendations` jobs of a single chunk.
+    The model only returns job IDs with a score and reason; the jobs themselves are joined back
+    from `jobs`, so no output tokens are spent copying them and links cannot be hallucinated.
+    """
+    prompt = build_ranking_prompt(resume, jobs, num_recommendations)
+    logger.debug(f"Ranking prompt for {len(jobs)} jobs uses {count_tokens(prompt, model)} tokens")
+
+    async def complete() -> Any:
+        if rate_limiter:
+            await rate_limiter.acquire()
+        return await client.beta.chat.completions.parse(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=JobRankings,
+        )
+
+    completion = await retry_async(complete, f"ranking of {len(jobs)} jobs", retry_budget)
+    if not completion.choices:
+        raise ValueError("No choices returned from OpenAI API")
+
+    response_content = completion.choices[0].message.content.strip()  # type: ignore
+    if not response_content:
+        raise ValueError("Empty response from OpenAI API")
+
+    recommended_jobs: list[RecommendedJob] = []
+    seen_ids: set[int] = set()
+    for ranking in JobRankings(**json.loads(response_content)).rankings:
+        if not 0 <= ranking.id < len(jobs) or ranking.id in seen_ids:
+            logger.warning(f"Ignoring invalid job id {ranking.id} returned by the model")
+            continue
+        seen_ids.add(ranking.id)
+        job = jobs[ranking.id].model_dump(include=set(JobSchema.model_fields))
+        recommended_jobs.append(RecommendedJob(**job, score=ranking.score, reason=ranking.reason))
+
+    return recommended_jobs[:num_recommendations]
+
+
+async def rank_jobs_async(
+    client: AsyncOpenAI,
+    resume: str,
+    jobs: list[JobSchema],
+    num_recommendations: int,
+    model: str = "gpt-4o",
+    max_chunk_tokens: int = 30000,
+    survivors_per_chunk: Optional[int] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+) -> list[RecommendedJob]:
+    """
+    Rank jobs of any size with a tournament (map-reduce) over token-bounded chunks.
+
+    While the listings do not fit into one prompt, they are split into chunks of at most
+    `max_chunk_tokens`, every chunk is ranked concurrently, and only its best jobs advance to the next
+    round: `survivors_per_chunk`, but never more than half the chunk (and never fewer than
+    `num_recommendations`), so every round shrinks the field. The number of sequential rounds grows
+    logarithmically with the corpus, and the final round ranks the remaining jobs in a single prompt.
+
+    If no chunk can be cut because none holds more than `num_recommendations` jobs, the chunks are
+    ranked in full and merged by the model's fit score, so no prompt ever exceeds `max_chunk_tokens`.
+    """
+    survivors_per_chunk = survivors_per_chunk or 2 * num_recommendations
+
+    def chunk_survivors(chunk: list[JobSchema]) -> int:
+        return min(survivors_per_chunk, max(num_recommendations, len(chunk) // 2))
+
+    round_number = 1
+    while True:
+        chunks = chunk_jobs(jobs, max_chunk_tokens, model)
+        if len(chunks) <= 1:
+            break
+
+        logger.info(f"Ranking round {round_number}: {len(jobs)} jobs in {len(chunks)} chunks")
+        ranked_chunks = await asyncio.gather(
+            *(
+                rank_chunk(client, resume, chunk, chunk_survivors(chunk), model, rate_limiter, retry_budget)
+                if len(chunk) > chunk_survivors(chunk)
+                else asyncio.sleep(0, result=[RecommendedJob(**job.model_dump()) for job in chunk])
+                for chunk in chunks
+            )
+        )
+        survivors: list[JobSchema] = [job for ranked_chunk in ranked_chunks for job in ranked_chunk]
+        if len(survivors) >= len(jobs):
+            logger.warning(
+                f"Chunks of {max_chunk_tokens} tokens hold no more than {num_recommendations} jobs each, "
+                "merging the rankings of every chunk by fit score"
+            )
+            ranked_chunks = await asyncio.gather(
+                *(rank_chunk(client, resume, chunk, len(chunk), model, rate_limiter, retry_budget) for chunk in chunks)
+            )
+            ranked = sorted(
+                (job for ranked_chunk in ranked_chunks for job in ranked_chunk),
+                key=lambda job: job.score or 0,
+                reverse=True,
+            )
+            return ranked[:num_recommendations]
+        jobs = survivors
+        round_number += 1
+
+    return await rank_chunk(client, resume, jobs, num_recommendations, model, rate_limiter, retry_budget)
+
+
+async def screen_jobs_async(
+    client: AsyncOpenAI,
+    resume: str,
+    jobs: list[JobSchema],
+    finalists: int,
+    model: str = "gpt-4o-mini",
+    max_chunk_tokens: int = 30000,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+) -> list[JobSchema]:
+    """
+    Pre-screen jobs with a small, fast model and return the `finalists` best-scored jobs.
+
+    All chunks are scored concurrently in a single pass. Each chunk returns twice its share of the
+    finalists, and the survivors of every chunk are merged by the model's fit score.
+    """
+    if len(jobs) <= finalists:
+        return jobs
+
+    chunks = chunk_jobs(jobs, max_chunk_tokens, model)
+    logger.info(f"Screening {len(jobs)} jobs in {len(chunks)} chunks with {model}")
+    ranked_chunks = await asyncio.gather(
+        *(
+            rank_chunk(
+                client,
+                resume,
+                chunk,
+                min(len(chunk), 2 * math.ceil(finalists * len(chunk) / len(jobs))),
+                model,
+                rate_limiter,
+                retry_budget,
+            )
+            for chunk in chunks
+        )
+    )
+    candidates = sorted(
+        (job for ranked_chunk in ranked_chunks for job in ranked_chunk),
+        key=lambda job: job.score or 0,
+        reverse=True,
+    )
+    logger.info(f"Screened {len(jobs)} jobs down to {min(finalists, len(candidates))} finalists")
+    return [JobSchema(**job.model_dump(include=set(JobSchema.model_fields))) for job in candidates[:finalists]]
+
+
+def scoring_prompt_version() -> str:
+    """
+    Return a short fingerprint of the pointwise scoring prompt and response format.
+    Stored scores are only reused while this fingerprint stays the same.
+    """
+    schema = json.dumps(JobScore.model_json_schema(), sort_keys=True)
+    return hash_text(f"{build_scoring_prompt('', None)}\n{schema}")[:12]
+
+
+def build_scoring_prompt(resume: str, job: Optional[JobSchema]) -> str:
+    # The resume comes first so the shared prefix of every scoring prompt can be cached by the API
+    job_description = (
+        f"Title: {job.job_title}\n"
+        f"    Division: {job.sub_division_of_organization}\n"
+        f"    Location: {job.location}\n"
+        f"    Compensation: {job.compensation}\n"
+        f"    Key skills: {', '.join(job.key_skills)}"
+        if job
+        else ""
+    )
+    return f"""
+    <instructions>
+    Analyze the resume and the job listing, and rate how well the role fits the candidate's experience and skills.
+    Return a fit score from 0 to 100 and a one-sentence reason.
+    </instructions>
+
+    <resume>
+    {resume}
+    </resume>
+
+    <job_listing>
+    {job_description}
+    </job_listing>
+    """
+
+
+async def score_job(
+    client: AsyncOpenAI,
+    resume: str,
+    job: JobSchema,
+    model: str = "gpt-4o",
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+) -> JobScore:
+    """
+    Ask the model for the fit score of a single job, independently of every other job.
+    """
+    prompt = build_scoring_prompt(resume, job)
+
+    async def complete() -> Any:
+        if rate_limiter:
+            await rate_limiter.acquire()
+        return await client.beta.chat.completions.parse(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=JobScore,
+        )
+
+    completion = await retry_async(complete, f"scoring of {job.apply_link}", retry_budget)
+    if not completion.choices or not completion.choices[0].message.content:
+        raise ValueError("Empty response from OpenAI API")
+
+    return JobScore(**json.loads(completion.choices[0].message.content))
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from src.logger import logger
+
+
+class RateLimiter:
+    """
+    Reservation-based rate limiter allowing at most `rate_limit` requests per `window_size` seconds.
+
+    Every caller reserves its send time *before* the request leaves, so concurrent tasks can never
+    pass the check together and overshoot the quota, and failed requests count against it just like
+    successful ones. Reservations are tracked as a sliding window, which matches how providers count
+    requests per minute and lets a run use the full quota without bursting past it.
+
+    The same instance can be shared between threads and the event loop: `acquire` is used from async
+    code and `acquire_sync` from blocking code.
+    """
+
+    def __init__(self, rate_limit: int, window_size: float) -> None:
+        if rate_limit < 1 or window_size <= 0:
+            raise ValueError("rate_limit must be at least 1 and window_size must be positive")
+
+        self.rate_limit = rate_limit
+        self.window_size = window_size
+        self._reservations: deque[float] = deque(maxlen=rate_limit)
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserve the next free request slot and return the number of seconds to wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = now
+            if len(self._reservations) == self.rate_limit:
+                # The oldest of the last `rate_limit` reservations must leave the window first
+                slot = max(now, self._reservations[0] + self.window_size)
+            self._reservations.append(slot)
+            return slot - now
+
+    async def acquire(self) -> None:
+        """
+        Wait asynchronously until a reserved request slot is due.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            logger.debug(f"Rate limit reached. Waiting {delay:.1f} seconds...")
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self) -> None:
+        """
+        Block until a reserved request slot is due.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            logger.info(f"Rate limit reached. Waiting {delay:.1f} seconds...")
+            time.sleep(delay)
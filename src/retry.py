@@ -0,0 +1,173 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+import openai
+import requests
+
+from src.api import FirecrawlAPIError, parse_retry_after
+from src.logger import logger
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class RetryBudget:
+    """
+    Per-run cap on the total number of retries across all API calls.
+
+    Once the budget is spent, failing calls give up immediately instead of retrying, so a provider
+    outage degrades the run gracefully rather than multiplying the load on the API.
+    """
+
+    def __init__(self, max_retries: int) -> None:
+        self.max_retries = max_retries
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return max(self.max_retries - self.spent, 0)
+
+    def try_spend(self) -> bool:
+        """
+        Take one retry from the budget. Returns False if the budget is exhausted.
+        """
+        with self._lock:
+            if self.spent >= self.max_retries:
+                return False
+            self.spent += 1
+            return True
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    if isinstance(exc, FirecrawlAPIError):
+        return exc.status_code
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code
+    return None
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """
+    Classify an error from a Firecrawl or OpenAI call as retryable (transient) or fatal.
+    Connection problems, timeouts, 429s and 5xx responses are retryable; everything else is fatal.
+    """
+    if isinstance(exc, (httpx.TransportError, openai.APIConnectionError, requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    status_code = _status_code(exc)
+    return status_code is not None and status_code in RETRYABLE_STATUS_CODES
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Return the delay the provider asked for via `Retry-After`, if any.
+    """
+    if isinstance(exc, FirecrawlAPIError):
+        return exc.retry_after
+    if isinstance(exc, openai.APIStatusError):
+        retry_after_ms = exc.response.headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+        return parse_retry_after(exc.response.headers.get("retry-after"))
+    if isinstance(exc, (requests.HTTPError, httpx.HTTPStatusError)) and exc.response is not None:
+        return parse_retry_after(exc.response.headers.get("Retry-After"))
+    return None
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    retry_after: Optional[float] = None,
+) -> float:
+    """
+    Exponential backoff with full jitter, never shorter than the provider's `Retry-After`.
+    """
+    delay = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _next_delay(
+    exc: Exception,
+    attempt: int,
+    description: str,
+    budget: Optional[RetryBudget],
+    max_attempts: int,
+    base_delay: float,
+    max_delay: float,
+) -> Optional[float]:
+    """
+    Return how long to wait before retrying after `exc`, or None if the call should give up.
+    """
+    if not is_retryable_error(exc) or attempt + 1 >= max_attempts:
+        return None
+    if budget is not None and not budget.try_spend():
+        logger.warning(f"Retry budget exhausted, not retrying {description}")
+        return None
+
+    delay = backoff_delay(attempt, base_delay, max_delay, retry_after_seconds(exc))
+    logger.info(f"Retrying {description} in {delay:.1f}s (attempt {attempt + 2}/{max_attempts}): {exc}")
+    return delay
+
+
+async def retry_async(
+    func: Callable[[], Awaitable[T]],
+    description: str,
+    budget: Optional[RetryBudget] = None,
+    max_attempts: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+) -> T:
+    """
+    Await `func()`, retrying retryable errors with exponential backoff and full jitter.
+    The last error is re-raised when the call is fatal, out of attempts, or the budget is spent.
+    """
+    attempt = 0
+    while True:
+        try:
+            return await func()
+        except Exception as e:
+            delay = _next_delay(e, attempt, description, budget, max_attempts, base_delay, max_delay)
+            if delay is None:
+                raise
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def retry_sync(
+    func: Callable[[], T],
+    description: str,
+    budget: Optional[RetryBudget] = None,
+    max_attempts: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+) -> T:
+    """
+    Blocking version of retry_async.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            delay = _next_delay(e, attempt, description, budget, max_attempts, base_delay, max_delay)
+            if delay is None:
+                raise
+        time.sleep(delay)
+        attempt += 1
@@ -1,39 +1,130 @@
 import asyncio
+import heapq
+import itertools
 import json
 import time
-from collections import deque
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Awaitable, Optional
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urljoin, urlsplit
 
+import httpx
+import numpy as np
 from firecrawl import FirecrawlApp  # type: ignore
 from openai import OpenAI
 from tqdm.asyncio import tqdm as atqdm
 
+from src.ann_index import IVFIndex
+from src.api import AsyncFirecrawlClient, async_openai_client
+from src.bm25 import BM25Index, ResumeMatcher, tokenize
+from src.cache import ExtractionCache, RecommendationCache, ScoreCache, fingerprint_job, fingerprint_jobs, hash_text
+from src.checkpoint import ExtractionCheckpoint
+from src.concurrency import AdaptiveConcurrencyLimiter, is_overload_error
+from src.early_stop import EarlyStopPolicy
+from src.embeddings import EmbeddingStore, job_embedding_text
+from src.link_discovery import discover_job_links
+from src.links import posting_key
 from src.logger import logger
-from src.types import ApplyLinksSchema, JobSchema, JobSchemas, ScrapeEndpointJsonSchema
+from src.ranking import (
+    rank_jobs_async,
+    ranking_prompt_version,
+    score_job,
+    scoring_prompt_version,
+    screen_jobs_async,
+)
+from src.rate_limit import RateLimiter
+from src.retry import RetryBudget, retry_async, retry_sync
+from src.streaming import StreamingRanker
+from src.structured_data import parse_job_posting
+from src.types import (
+    JobListing,
+    JobListingsSchema,
+    JobSchema,
+    JobSchemas,
+    JobScore,
+    RecommendedJob,
+    Recommendations,
+    ScrapeEndpointJsonSchema,
+)
+
+EXTRACTION_PROMPT = "Extract details about the job posting. Leave fields blank if uncertain. Do not make things up."
+BATCH_EXTRACTION_PROMPT = (
+    "Extract details about each job posting, returning exactly one job per URL. "
+    "Set apply_link to the URL the job was extracted from. "
+    "Leave fields blank if uncertain. Do not make things up."
+)
+HTML_USER_AGENT = "Mozilla/5.0 (compatible; ai-jobfinder)"
+
+
+def extraction_version() -> str:
+    """
+    Return a short fingerprint of the extraction prompt and schema.
+    Cached extractions are only reused while this fingerprint stays the same.
+    """
+    schema = json.dumps(JobSchema.model_json_schema(), sort_keys=True)
+    return hash_text(f"{EXTRACTION_PROMPT}\n{schema}")[:12]
 
 
-def scrape_jobs_page(firecrawl: FirecrawlApp, url: str, output_dir: Path) -> Optional[ScrapeEndpointJsonSchema]:
+async def scrape_jobs_page_async(
+    client: AsyncFirecrawlClient,
+    url: str,
+    output_dir: Path,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    link_discovery: bool = True,
+    link_patterns: Optional[list[str]] = None,
+) -> Optional[ScrapeEndpointJsonSchema]:
     """
-    Scrape job listings from a given URL using the Firecrawl API.
-    If the scrape result is already cached, it will be returned from the cache.
+    Scrape job listings (apply link, title and team of every posting) from a given URL using the Firecrawl API.
+    With `link_discovery`, the page's HTML is scraped and the job links are found locally (see
+    discover_job_links); the LLM JSON scrape is only used when no job links are found.
+    If the scrape result is already cached, it will be returned from the cache. Results are cached per
+    discovery mode (and link patterns), so switching to the LLM scrape or other patterns scrapes again.
+    Transient failures are retried with backoff.
     """
     safe_url = url.replace("/", "_")
-    scrape_result_path = Path(f"{output_dir}/scrape_result-{safe_url}.json")
+    mode = ""
+    if link_discovery:
+        patterns_hash = hash_text("\n".join(link_patterns or []))[:8]
+        mode = f"-local-{patterns_hash}" if link_patterns else "-local"
+    scrape_result_path = Path(f"{output_dir}/scrape_result-{safe_url}{mode}.json")
 
     if scrape_result_path.exists():
         with open(scrape_result_path, "r") as f:
             return json.load(f)
 
+    def scrape(params: dict[str, Any]) -> Callable[[], Awaitable[dict[str, Any]]]:
+        async def call() -> dict[str, Any]:
+            if rate_limiter:
+                await rate_limiter.acquire()
+            return await client.scrape_url(url, params)
+
+        return call
+
     try:
-        scrape_result = firecrawl.scrape_url(
-            url,
-            {
-                "formats": ["json"],
-                "jsonOptions": {"schema": ApplyLinksSchema.model_json_schema()},
-            },
-        )
+        scrape_result: Any = None
+        if link_discovery:
+            page = await retry_async(scrape({"formats": ["html"]}), f"HTML scrape of {url}", retry_budget)
+            listings = discover_job_links(page.get("html") or "", url, link_patterns)
+            if listings:
+                logger.info(f"Found {len(listings)} job links in the HTML of {url}")
+                scrape_result = {
+                    "json": JobListingsSchema(job_listings=listings).model_dump(),
+                    "metadata": page.get("metadata", {}),
+                }
+            else:
+                logger.info(f"No job links found in the HTML of {url}, asking the LLM instead")
+
+        if scrape_result is None:
+            scrape_result = await retry_async(
+                scrape(
+                    {
+                        "formats": ["json"],
+                        "jsonOptions": {"schema": JobListingsSchema.model_json_schema()},
+                    }
+                ),
+                f"scrape of {url}",
+                retry_budget,
+            )
         if not scrape_result or "json" not in scrape_result:
             raise ValueError("Failed to get valid scrape result")
     except Exception:
@@ -46,18 +137,147 @@ def scrape_jobs_page(firecrawl: FirecrawlApp, url: str, output_dir: Path) -> Opt
         return scrape_result
 
 
-def extract_job_data(link: str, firecrawl: FirecrawlApp) -> Optional[JobSchema]:
+def scrape_jobs_pages(
+    firecrawl: FirecrawlApp,
+    urls: list[str],
+    output_dir: Path,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    link_discovery: bool = True,
+    link_patterns: Optional[list[str]] = None,
+) -> dict[str, Optional[ScrapeEndpointJsonSchema]]:
+    """
+    Scrape several jobs pages concurrently, sharing one Firecrawl rate limiter.
+    Returns the scrape result of every URL, or None for pages that could not be scraped.
+    """
+
+    async def scrape_all() -> list[Optional[ScrapeEndpointJsonSchema]]:
+        async with AsyncFirecrawlClient.from_app(firecrawl, retry_budget=retry_budget) as client:
+            return await asyncio.gather(
+                *(
+                    scrape_jobs_page_async(
+                        client, url, output_dir, rate_limiter, retry_budget, link_discovery, link_patterns
+                    )
+                    for url in urls
+                )
+            )
+
+    return dict(zip(urls, asyncio.run(scrape_all())))
+
+
+def scrape_jobs_page(
+    firecrawl: FirecrawlApp,
+    url: str,
+    output_dir: Path,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    link_discovery: bool = True,
+    link_patterns: Optional[list[str]] = None,
+) -> Optional[ScrapeEndpointJsonSchema]:
+    """
+    Scrape job listings from a single URL. See scrape_jobs_page_async.
+    """
+    return scrape_jobs_pages(firecrawl, [url], output_dir, rate_limiter, retry_budget, link_discovery, link_patterns)[url]
+
+
+def merge_job_listings(
+    scrape_results: dict[str, ScrapeEndpointJsonSchema],
+    known_jobs: Optional[list[JobSchema]] = None,
+) -> list[JobListing]:
+    """
+    Merge the job listings of one or more jobs pages, given by jobs page URL. Relative apply links are
+    resolved against their jobs page, and listings that point to the same posting (e.g. with different
+    tracking parameters, or as both the detail page and the ATS application form) are deduplicated
+    before any paid extraction, keeping the first listing and its link as scraped.
+    Listings of postings that are already among `known_jobs` (e.g. fetched from an ATS board API) are dropped.
+    """
+    known_keys = {posting_key(job.apply_link) for job in known_jobs or []}
+    listings: dict[str, JobListing] = {}
+    num_listings = 0
+    for page_url, scrape_result in scrape_results.items():
+        for listing in get_job_listings(scrape_result):
+            num_listings += 1
+            listing.apply_link = urljoin(page_url, listing.apply_link.strip())
+            key = posting_key(listing.apply_link)
+            if key not in known_keys:
+                listings.setdefault(key, listing)
+
+    if num_listings > len(listings):
+        logger.info(
+            f"Removed {num_listings - len(listings)} duplicate apply links, "
+            f"saving {num_listings - len(listings)} extraction calls"
+        )
+    return list(listings.values())
+
+
+def run_name(urls: list[str]) -> str:
+    """
+    Return the name that identifies a run's checkpoint: the jobs page URL, or a hash of all of them in multi-site mode.
+    """
+    if len(urls) == 1:
+        return urls[0]
+    urls_hash = hash_text("\n".join(sorted(urls)))
+    return f"multi-{urls_hash[:12]}"
+
+
+def get_job_listings(scrape_result: ScrapeEndpointJsonSchema) -> list[JobListing]:
+    """
+    Return the job listings of a scrape result. Results cached before titles and teams were
+    scraped only have apply links, which become listings with an empty title and team.
+    """
+    data = scrape_result["json"]
+    if "job_listings" in data:
+        return JobListingsSchema(**data).job_listings
+    return [JobListing(apply_link=link, title="", team="") for link in data.get("apply_links", [])]
+
+
+def prioritize_listings(resume: str, listings: list[JobListing]) -> list[JobListing]:
+    """
+    Order listings by how well their title and team match the resume, best first, so the `max_jobs`
+    extraction budget goes to the postings most likely to be recommended.
+    Listings that match equally well keep their page order.
+    """
+    matcher = ResumeMatcher(resume)
+    return sorted(listings, key=lambda listing: -matcher.score(tokenize(f"{listing.title} {listing.team}")))
+
+
+def prioritize_jobs(resume: str, jobs: list[JobSchema]) -> list[JobSchema]:
+    """
+    Order already known jobs (e.g. fetched from an ATS board API) by how well their title and
+    division match the resume, best first, so the `max_jobs` limit keeps the most relevant ones.
+    Jobs that match equally well keep their original order.
+    """
+    matcher = ResumeMatcher(resume)
+    return sorted(jobs, key=lambda job: -matcher.score(tokenize(f"{job.job_title} {job.sub_division_of_organization}")))
+
+
+def extract_job_data(
+    link: str,
+    firecrawl: FirecrawlApp,
+    cache: Optional[ExtractionCache] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+) -> Optional[JobSchema]:
     """
     Extract job data from a given link using the Firecrawl API.
+    If the link has already been extracted, the cached job is returned instead.
     """
-    try:
-        result = firecrawl.extract(
+    if cache and (cached_job := cache.get(link)):
+        return cached_job
+
+    def extract() -> Any:
+        if rate_limiter:
+            rate_limiter.acquire_sync()
+        return firecrawl.extract(
             [link],
             {
-                "prompt": "Extract details about the job posting. Leave fields blank if uncertain. Do not make things up.",
+                "prompt": EXTRACTION_PROMPT,
                 "schema": JobSchema.model_json_schema(),
             },
         )
+
+    try:
+        result = retry_sync(extract, f"extraction of {link}", retry_budget)
         if not result.get("success"):
             logger.warning(f"Failed to extract data from {link}. Response: {result}")
             return None
@@ -67,68 +287,213 @@ def extract_job_data(link: str, firecrawl: FirecrawlApp) -> Optional[JobSchema]:
             logger.warning(f"No data extracted from {link}")
             return None
 
-        return JobSchema(**data)
+        job = JobSchema(**data)
+        if cache:
+            cache.set(link, job)
+        return job
 
     except Exception:
         logger.exception(f"Failed to extract data from {link}", exc_info=True)
         return None
 
 
+async def _call_firecrawl(
+    call: Callable[[], Awaitable[dict[str, Any]]],
+    rate_limiter: RateLimiter,
+    concurrency: AdaptiveConcurrencyLimiter,
+) -> dict[str, Any]:
+    """
+    Make one Firecrawl request while holding a concurrency slot and a reserved rate limit slot,
+    reporting its latency or overload error to the adaptive concurrency limiter.
+    """
+    async with concurrency.slot():
+        await rate_limiter.acquire()
+
+        start_time = time.monotonic()
+        try:
+            result = await call()
+        except Exception as e:
+            if is_overload_error(e):
+                concurrency.record_overload()
+            raise
+        concurrency.record_success(time.monotonic() - start_time)
+        return result
+
+
 async def extract_job_data_async(
     link: str,
-    firecrawl: FirecrawlApp,
-    request_timestamps: deque[float],
-    rate_limit: int,
-    window_size: int,
-    semaphore: asyncio.Semaphore,
+    firecrawl: AsyncFirecrawlClient,
+    rate_limiter: RateLimiter,
+    concurrency: AdaptiveConcurrencyLimiter,
+    cache: Optional[ExtractionCache] = None,
+    retry_budget: Optional[RetryBudget] = None,
 ) -> Optional[JobSchema]:
     """
-    Asynchronous version of extract_job_data that handles rate limiting.
-    """
-    async with semaphore:  # Control concurrent requests
-        # Wait for rate limit in an async way
-        current_time = time.time()
-        while len(request_timestamps) >= rate_limit:
-            oldest_time = request_timestamps[0]
-            if oldest_time > current_time - window_size:
-                wait_time = oldest_time - (current_time - window_size) + 0.1
-                await asyncio.sleep(wait_time)
-                current_time = time.time()
-            else:
-                request_timestamps.popleft()
-
-        try:
-            # Run the synchronous Firecrawl API call in a thread pool
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as pool:
-                result = await loop.run_in_executor(
-                    pool,
-                    lambda: firecrawl.extract(
-                        [link],
-                        {
-                            "prompt": "Extract details about the job posting. Leave fields blank if uncertain. Do not make things up.",
-                            "schema": JobSchema.model_json_schema(),
-                        },
-                    ),
-                )
+    Asynchronous version of extract_job_data that reserves a rate limit slot before each request.
+    Uses the shared AsyncFirecrawlClient so concurrent extractions reuse pooled connections,
+    and reports every request's latency and outcome to the adaptive concurrency limiter.
+    Transient failures are retried with backoff while the retry budget lasts.
+    Cached links are returned immediately without using a rate limit slot.
+    """
+    if cache and (cached_job := cache.get(link)):
+        return cached_job
 
-            if not result.get("success"):
-                logger.warning(f"Failed to extract data from {link}. Response: {result}")
-                return None
+    def extract() -> Awaitable[dict[str, Any]]:
+        return firecrawl.extract(
+            [link],
+            {
+                "prompt": EXTRACTION_PROMPT,
+                "schema": JobSchema.model_json_schema(),
+            },
+        )
 
-            data = result.get("data")
-            if not data:
-                logger.warning(f"No data extracted from {link}")
-                return None
+    try:
+        result = await retry_async(
+            lambda: _call_firecrawl(extract, rate_limiter, concurrency),
+            f"extraction of {link}",
+            retry_budget,
+        )
 
-            request_timestamps.append(time.time())
-            logger.info(f"Successfully processed {link}")
-            return JobSchema(**data)
+        if not result.get("success"):
+            logger.warning(f"Failed to extract data from {link}. Response: {result}")
+            return None
 
-        except Exception:
-            logger.exception(f"Failed to extract data from {link}", exc_info=True)
+        data = result.get("data")
+        if not data:
+            logger.warning(f"No data extracted from {link}")
             return None
 
+        logger.info(f"Successfully processed {link}")
+        job = JobSchema(**data)
+        if cache:
+            cache.set(link, job)
+        return job
+
+    except Exception:
+        logger.exception(f"Failed to extract data from {link}", exc_info=True)
+        return None
+
+
+async def extract_structured_job(
+    link: str,
+    client: httpx.AsyncClient,
+    cache: Optional[ExtractionCache] = None,
+    fetch_slots: Optional[asyncio.Semaphore] = None,
+) -> Optional[JobSchema]:
+    """
+    Fetch a job page's raw HTML and build the job from its schema.org JobPosting data (JSON-LD or microdata).
+    Returns None if the page could not be fetched or has no usable structured data.
+    With `fetch_slots`, the fetch waits for a slot first, so queued fetches never time out waiting for a connection.
+    """
+    if cache and (cached_job := cache.get(link)):
+        return cached_job
+
+    try:
+        if fetch_slots:
+            async with fetch_slots:
+                response = await client.get(link)
+        else:
+            response = await client.get(link)
+        response.raise_for_status()
+    except Exception as e:
+        logger.debug(f"Could not fetch {link} for structured data: {e}")
+        return None
+    if "html" not in response.headers.get("content-type", "html"):
+        return None
+
+    job = parse_job_posting(response.text, link)
+    if job:
+        logger.info(f"Built {link} from structured data")
+        if cache:
+            cache.set(link, job)
+    return job
+
+
+def _host(link: str) -> str:
+    return urlsplit(link.strip()).netloc.lower()
+
+
+def _batches_by_host(links: list[str], batch_size: int) -> list[list[str]]:
+    """
+    Split links into batches of a single host each, interleaved round-robin across hosts, so every
+    site gets its turn at the shared concurrency and rate limits. Each host keeps its own link order.
+    """
+    links_by_host: dict[str, list[str]] = {}
+    for link in links:
+        links_by_host.setdefault(_host(link), []).append(link)
+    host_batches = [
+        [host_links[i : i + batch_size] for i in range(0, len(host_links), batch_size)]
+        for host_links in links_by_host.values()
+    ]
+    return [batch for batches in itertools.zip_longest(*host_batches) for batch in batches if batch]
+
+
+async def extract_job_data_batch_async(
+    links: list[str],
+    firecrawl: AsyncFirecrawlClient,
+    rate_limiter: RateLimiter,
+    concurrency: AdaptiveConcurrencyLimiter,
+    cache: Optional[ExtractionCache] = None,
+    retry_budget: Optional[RetryBudget] = None,
+) -> list[tuple[str, Optional[JobSchema]]]:
+    """
+    Extract several job links with a single Firecrawl extract call.
+    The returned jobs are matched back to their links by apply link, and any link that cannot be
+    matched (or the whole batch, if the call fails) falls back to single-link extraction.
+    """
+    results: dict[str, Optional[JobSchema]] = {}
+    pending: list[str] = []
+    for link in links:
+        if cache and (cached_job := cache.get(link)):
+            results[link] = cached_job
+        else:
+            pending.append(link)
+
+    if len(pending) > 1:
+
+        def extract() -> Awaitable[dict[str, Any]]:
+            return firecrawl.extract(
+                pending,
+                {
+                    "prompt": BATCH_EXTRACTION_PROMPT,
+                    "schema": JobSchemas.model_json_schema(),
+                },
+            )
+
+        try:
+            result = await retry_async(
+                lambda: _call_firecrawl(extract, rate_limiter, concurrency),
+                f"batch extraction of {len(pending)} links",
+                retry_budget,
+            )
+
+            data = result.get("data") if result.get("success") else None
+            pending_by_key = {posting_key(link): link for link in pending}
+            for job_data in (data or {}).get("jobs", []):
+                job = JobSchema(**job_data)
+                link = pending_by_key.pop(posting_key(job.apply_link), None)
+                if link and link not in results:
+                    results[link] = job
+                    if cache:
+                        cache.set(link, job)
+
+        except Exception as e:
+            logger.warning(f"Batch extraction of {len(pending)} links failed, falling back to single links: {e}")
+
+        pending = [link for link in pending if link not in results]
+        if pending:
+            logger.info(f"Extracting {len(pending)} unmatched links from a batch one by one")
+
+    fallback_jobs = await asyncio.gather(
+        *(
+            extract_job_data_async(link, firecrawl, rate_limiter, concurrency, cache=cache, retry_budget=retry_budget)
+            for link in pending
+        )
+    )
+    results.update(zip(pending, fallback_jobs))
+
+    return [(link, results[link]) for link in links]
+
 
 async def process_job_links_async(
     links: list[str],
@@ -136,50 +501,173 @@ async def process_job_links_async(
     max_jobs: int = 20,
     rate_limit: int = 10,
     window_size: int = 60,
-    max_concurrent: int = 5,
+    max_concurrent: int = 20,
+    initial_concurrent: int = 5,
+    cache: Optional[ExtractionCache] = None,
+    checkpoint: Optional[ExtractionCheckpoint] = None,
+    resume: bool = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    batch_size: int = 1,
+    retry_budget: Optional[RetryBudget] = None,
+    max_per_host: int = 0,
+    known_jobs: Optional[list[JobSchema]] = None,
+    structured_data: bool = False,
+    on_job: Optional[Callable[[JobSchema], None]] = None,
+    early_stop: Optional[EarlyStopPolicy] = None,
 ) -> list[JobSchema]:
     """
     Process job links concurrently while respecting rate limits.
 
     Args:
         links: List of job links to process
-        firecrawl: FirecrawlApp instance
-        url: The URL of the job listings page
-        max_jobs: Maximum number of jobs to process
+        firecrawl: FirecrawlApp instance whose credentials are used for a run-wide AsyncFirecrawlClient
+        max_jobs: Maximum number of jobs to process, counting known_jobs first (in the order given)
         rate_limit: Maximum number of requests per window
         window_size: Time window in seconds for rate limiting
-        max_concurrent: Maximum number of concurrent requests
+        max_concurrent: Upper bound for the adaptive number of concurrent requests
+        initial_concurrent: Number of concurrent requests to start with
+        cache: Optional per-link cache consulted before calling the Firecrawl API
+        checkpoint: Optional checkpoint that every extracted job is appended to as soon as it completes
+        resume: Replay the checkpoint and only schedule the links that are missing from it
+        rate_limiter: Shared Firecrawl rate limiter. Created from rate_limit and window_size if not given
+        batch_size: Number of links sent per Firecrawl extract call
+        retry_budget: Optional cap on the total number of retries across all extractions
+        max_per_host: Maximum number of concurrent extractions per apply link host (0 for no per-host limit)
+        known_jobs: Jobs that are already known without extraction (e.g. fetched from an ATS board API),
+            returned and reported to on_job and early_stop along with the extracted jobs
+        structured_data: Fetch each page's HTML first and build the job from its schema.org JobPosting data
+            when it has any, only extracting the other pages with Firecrawl
+        on_job: Optional callback called with every job as soon as it is available (including resumed jobs)
+        early_stop: Optional policy that cancels the pending extractions once the top jobs are settled
     """
-    request_timestamps: deque[float] = deque()
-    semaphore = asyncio.Semaphore(max_concurrent)
-
-    async def process_links() -> list[JobSchema]:
-        tasks: list[Awaitable[Optional[JobSchema]]] = [
-            extract_job_data_async(
-                link,
-                firecrawl,
-                request_timestamps,
-                rate_limit,
-                window_size,
-                semaphore,
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(rate_limit, window_size)
+    concurrency = AdaptiveConcurrencyLimiter(initial_limit=initial_concurrent, max_limit=max_concurrent)
+
+    known = (known_jobs or [])[:max_jobs]
+    links = links[: max_jobs - len(known)]
+    results: list[JobSchema] = []
+    if checkpoint:
+        if resume:
+            completed = checkpoint.load()
+            results = [completed[link] for link in links if link in completed]
+            links = [link for link in links if link not in completed]
+            logger.info(f"Resuming from checkpoint: {len(results)} jobs already extracted, {len(links)} links remaining")
+        else:
+            checkpoint.reset()
+    results = known + results
+    if on_job:
+        for job in results:
+            on_job(job)
+    if early_stop:
+        early_stop.track(links)
+        for job in results:
+            early_stop.observe(job.apply_link, job)
+
+    if cache:
+        num_cached = sum(link in cache for link in links)
+        logger.info(f"Found {num_cached} cached jobs, extracting {len(links) - num_cached} new links")
+
+    host_slots: dict[str, asyncio.Semaphore] = {}
+    structured_count = 0
+    html_client: Optional[httpx.AsyncClient] = None
+    html_slots: Optional[asyncio.Semaphore] = None
+    # Structured-data jobs are cached apart from LLM extractions, so --no-structured-data never serves them
+    structured_cache = cache.for_source("structured") if cache and structured_data else None
+
+    async def process_batch(client: AsyncFirecrawlClient, batch: list[str]) -> list[tuple[str, Optional[JobSchema]]]:
+        if max_per_host:
+            # Batches hold links of a single host, so one per-host slot covers the whole batch
+            async with host_slots.setdefault(_host(batch[0]), asyncio.Semaphore(max_per_host)):
+                return await extract_batch(client, batch)
+        return await extract_batch(client, batch)
+
+    async def extract_batch(client: AsyncFirecrawlClient, batch: list[str]) -> list[tuple[str, Optional[JobSchema]]]:
+        nonlocal structured_count
+        structured: list[tuple[str, Optional[JobSchema]]] = []
+        if html_client:
+            # Pages with schema.org JobPosting data are built locally and skip the LLM extraction.
+            # Links that were already extracted by the LLM are served from its cache without a fetch.
+            candidates = [link for link in batch if not (cache and link in cache)]
+            jobs = await asyncio.gather(
+                *(extract_structured_job(link, html_client, structured_cache, html_slots) for link in candidates)
             )
-            for link in links[:max_jobs]
-        ]
+            structured = [(link, job) for link, job in zip(candidates, jobs) if job]
+            built = {link for link, _ in structured}
+            batch = [link for link in batch if link not in built]
+            structured_count += len(structured)
+            if not batch:
+                return structured
+
+        if len(batch) == 1:
+            job = await extract_job_data_async(
+                batch[0], client, rate_limiter, concurrency, cache=cache, retry_budget=retry_budget
+            )
+            return structured + [(batch[0], job)]
+        return structured + await extract_job_data_batch_async(
+            batch, client, rate_limiter, concurrency, cache=cache, retry_budget=retry_budget
+        )
 
-        results: list[JobSchema] = []
-        async for coro in atqdm(
-            asyncio.as_completed(tasks),
-            total=len(tasks),
-            desc="Processing job links",
-            unit="job",
-        ):
-            result = await coro
-            if isinstance(result, JobSchema):
-                results.append(result)
+    async def process_links(client: AsyncFirecrawlClient) -> list[JobSchema]:
+        batches = _batches_by_host(links, batch_size)
+        tasks: list[asyncio.Task[list[tuple[str, Optional[JobSchema]]]]] = [
+            asyncio.create_task(process_batch(client, batch)) for batch in batches
+        ]
 
+        stop = False
+        with atqdm(total=len(links), desc="Processing job links", unit="job") as progress:
+            for coro in asyncio.as_completed(tasks):
+                batch_results = await coro
+                for link, result in batch_results:
+                    if isinstance(result, JobSchema):
+                        results.append(result)
+                        if checkpoint:
+                            checkpoint.append(link, result)
+                        if on_job:
+                            on_job(result)
+                    if early_stop and early_stop.observe(link, result):
+                        stop = True
+                progress.update(len(batch_results))
+                if stop:
+                    break
+
+        if stop:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        logger.info(
+            f"Extraction finished with concurrency {concurrency.limit} "
+            f"(peak {concurrency.peak_limit}, max {max_concurrent})"
+        )
         return results
 
-    return await process_links()
+    async with AsyncFirecrawlClient.from_app(
+        firecrawl, max_connections=max(max_concurrent, 10), retry_budget=retry_budget
+    ) as client:
+        if not structured_data:
+            return await process_links(client)
+
+        # Page fetches start as soon as their batch is scheduled, so they take one of a fixed number of
+        # slots (one per pooled connection) instead of queueing on the pool, where they would time out
+        html_connections = max(max_concurrent, 10)
+        html_slots = asyncio.Semaphore(html_connections)
+        async with httpx.AsyncClient(
+            headers={"User-Agent": HTML_USER_AGENT},
+            follow_redirects=True,
+            timeout=httpx.Timeout(10.0, pool=None),
+            limits=httpx.Limits(max_connections=html_connections),
+        ) as html_client:
+            jobs = await process_links(client)
+            logger.info(f"Built {structured_count} jobs from structured data without LLM extraction")
+            return jobs
+
+
+def _extraction_stores(url: str, output_dir: Path) -> tuple[ExtractionCache, ExtractionCheckpoint]:
+    safe_url = url.replace("/", "_")
+    cache = ExtractionCache(Path(f"{output_dir}/extraction_cache"), extraction_version())
+    checkpoint = ExtractionCheckpoint(Path(f"{output_dir}/checkpoint-{safe_url}.jsonl"))
+    return cache, checkpoint
 
 
 def process_job_links(
@@ -190,15 +678,22 @@ def process_job_links(
     rate_limit: int = 10,
     window_size: int = 60,
     output_dir: Path = Path("results"),
+    resume: bool = False,
+    rate_limiter: Optional[RateLimiter] = None,
+    max_concurrent: int = 20,
+    batch_size: int = 1,
+    retry_budget: Optional[RetryBudget] = None,
+    max_per_host: int = 0,
+    known_jobs: Optional[list[JobSchema]] = None,
+    structured_data: bool = False,
+    early_stop: Optional[EarlyStopPolicy] = None,
 ) -> list[JobSchema]:
     """
     Synchronous wrapper for the asynchronous process_job_links_async function.
+    Extracted jobs are cached per apply link in `output_dir`, so reruns only extract new links,
+    and checkpointed per run so an interrupted run can be continued with `resume=True`.
     """
-    safe_url = url.replace("/", "_")
-    processed_jobs_path = Path(f"{output_dir}/processed_jobs-{safe_url}.json")
-    if processed_jobs_path.exists():
-        with open(processed_jobs_path, "r") as f:
-            return [JobSchema(**job) for job in json.load(f)]
+    cache, checkpoint = _extraction_stores(url, output_dir)
 
     return asyncio.run(
         process_job_links_async(
@@ -207,79 +702,164 @@ def process_job_links(
             max_jobs=max_jobs,
             rate_limit=rate_limit,
             window_size=window_size,
+            max_concurrent=max_concurrent,
+            initial_concurrent=min(5, max_concurrent),
+            cache=cache,
+            checkpoint=checkpoint,
+            resume=resume,
+            rate_limiter=rate_limiter,
+            batch_size=batch_size,
+            retry_budget=retry_budget,
+            max_per_host=max_per_host,
+            known_jobs=known_jobs,
+            structured_data=structured_data,
+            early_stop=early_stop,
         )
     )
 
 
-def get_job_recommendations(
+def shortlist_jobs(
     openai: OpenAI,
     resume: str,
-    url: str,
     jobs: list[JobSchema],
-    num_recommendations: int = 5,
+    top_k: int,
     output_dir: Path = Path("results"),
-) -> JobSchemas | None:
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    ann_nprobe: int = 0,
+) -> list[JobSchema]:
     """
-    Query the OpenAI API to get job recommendations based on a resume and job listings.
-    If the recommendations are already cached, they will be returned from the cache.
+    Pre-rank jobs by embedding similarity to the resume and keep only the `top_k` nearest,
+    so only the most promising jobs are sent to the LLM for ranking.
+    Embeddings are kept in persistent vector indexes, so each resume and job is only embedded once.
+    With `ann_nprobe` set, the search goes through an approximate IVF index probing that many lists.
+    """
+    if len(jobs) <= top_k:
+        return jobs
+
+    store = EmbeddingStore(Path(f"{output_dir}/embeddings"))
+    job_keys = store.embed(
+        openai,
+        store.jobs,
+        [job_embedding_text(job) for job in jobs],
+        rate_limiter=rate_limiter,
+        retry_budget=retry_budget,
+    )
+    resume_keys = store.embed(openai, store.queries, [resume], rate_limiter=rate_limiter, retry_budget=retry_budget)
+
+    query = store.queries.get(resume_keys)[0]
+    if ann_nprobe:
+        ann = IVFIndex(store.jobs, nprobe=ann_nprobe)
+        ann.update()
+        # Several jobs can share an embedding row; keep the first job for each row
+        positions: dict[int, int] = {}
+        for position, key in enumerate(job_keys):
+            positions.setdefault(store.jobs.rows[key], position)
+        matches = ann.search(query, top_k, allowed_rows=np.fromiter(positions, dtype=np.int64))
+        shortlist = [jobs[positions[row]] for row, _ in matches]
+    else:
+        matches = store.jobs.search(query, top_k, keys=job_keys)
+        shortlist = [jobs[position] for position, _ in matches]
+    logger.info(f"Shortlisted {len(shortlist)} of {len(jobs)} jobs by embedding similarity")
+    return shortlist
 
-    Returns a JSON list of the top 5 recommended roles.
+
+def shortlist_jobs_bm25(resume: str, jobs: list[JobSchema], top_k: int) -> list[JobSchema]:
     """
-    safe_url = url.replace("/", "_")
-    recommendations_path = Path(f"{output_dir}/recommendations-{safe_url}.json")
-
-    if recommendations_path.exists():
-        with open(recommendations_path, "r") as f:
-            try:
-                data = json.load(f)
-                # Handle both formats: direct list or wrapped in jobs key
-                if isinstance(data, list):
-                    return JobSchemas(jobs=[JobSchema(**job) for job in data])
-                return JobSchemas(**data)
-            except json.JSONDecodeError:
-                # If the file is empty or invalid, we will rerun the process
-                pass
-
-    prompt = f"""
-    <instructions>
-    Analyze the resume and job listings, and return a JSON list of the top {num_recommendations} roles that best fit the candidate's experience and skills.
-    The output should be a valid JSON array of {num_recommendations} objects.
-    </instructions>
-
-    <resume>
-    {resume}
-    </resume>
-
-    <job_listings>
-    {json.dumps([job.model_dump() for job in jobs], indent=2)}
-    </job_listings>
+    Pre-rank jobs locally by BM25 over their skills and titles and keep only the `top_k` best matches.
     """
+    if len(jobs) <= top_k:
+        return jobs
 
-    try:
-        completion = openai.beta.chat.completions.parse(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            response_format=JobSchemas,
-        )
+    shortlist = [jobs[position] for position, _ in BM25Index(jobs).search(resume, top_k)]
+    logger.info(f"Shortlisted {len(shortlist)} of {len(jobs)} jobs by BM25 skill match")
+    return shortlist
 
-        if not completion.choices:
-            raise ValueError("No choices returned from OpenAI API")
 
-        response_content = completion.choices[0].message.content.strip()  # type: ignore
-        if not response_content:
-            raise ValueError("Empty response from OpenAI API")
+def get_bm25_recommendations(resume: str, jobs: list[JobSchema], num_recommendations: int = 5) -> Recommendations:
+    """
+    Rank jobs locally by BM25 over their skills and titles, without calling an LLM.
+    The reason of each recommendation lists the resume terms the job matched.
+    """
+    index = BM25Index(jobs)
+    recommended_jobs = [
+        RecommendedJob(
+            **jobs[position].model_dump(),
+            score=round(score, 2),
+            reason=f"Matches {', '.join(index.matched_terms(resume, position)) or 'no resume terms'}",
+        )
+        for position, score in index.search(resume, num_recommendations)
+    ]
+    return Recommendations(jobs=recommended_jobs)
+
 
-        result = JobSchemas(**json.loads(response_content))
+def get_job_recommendations(
+    openai: OpenAI,
+    resume: str,
+    jobs: list[JobSchema],
+    num_recommendations: int = 5,
+    output_dir: Path = Path("results"),
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    max_chunk_tokens: int = 30000,
+    model: str = "gpt-4o",
+    screen_model: Optional[str] = None,
+    screen_chunk_tokens: int = 30000,
+    finalists: int = 30,
+) -> Recommendations | None:
+    """
+    Query the OpenAI API to get job recommendations based on a resume and job listings.
+    Recommendations are cached by a hash of the resume, the job corpus and the ranking settings,
+    so a rerun with the same inputs is returned from the cache.
+    With `screen_model` set, the jobs are first screened by that (cheaper) model in parallel chunks of
+    `screen_chunk_tokens`, and only the best `finalists` are ranked by `model`.
+    Job listings that do not fit into `max_chunk_tokens` are ranked in a map-reduce tournament.
 
-        # Save with the correct structure
-        with open(recommendations_path, "w") as f:
-            json.dump(
-                {"jobs": [job.model_dump() for job in result.jobs]},
-                f,
-                indent=2,
-                ensure_ascii=False,
+    Returns the top `num_recommendations` roles, each with the model's fit score and reason.
+    """
+    cache = RecommendationCache(Path(f"{output_dir}/recommendations"))
+    cache_params = {
+        "resume": hash_text(resume),
+        "jobs": fingerprint_jobs(jobs),
+        "num_recommendations": num_recommendations,
+        "model": model,
+        "prompt_version": ranking_prompt_version(),
+        "max_chunk_tokens": max_chunk_tokens,
+        "screen": [screen_model, screen_chunk_tokens, finalists] if screen_model else None,
+    }
+    cache_key = cache.make_key(**cache_params)
+    if cached_recommendations := cache.get(cache_key):
+        logger.info("Using cached recommendations")
+        return cached_recommendations
+
+    async def rank() -> list[RecommendedJob]:
+        async with async_openai_client(openai) as client:
+            finalist_jobs = jobs
+            if screen_model:
+                finalist_jobs = await screen_jobs_async(
+                    client,
+                    resume,
+                    jobs,
+                    finalists,
+                    model=screen_model,
+                    max_chunk_tokens=screen_chunk_tokens,
+                    rate_limiter=rate_limiter,
+                    retry_budget=retry_budget,
+                )
+            return await rank_jobs_async(
+                client,
+                resume,
+                finalist_jobs,
+                num_recommendations,
+                model=model,
+                max_chunk_tokens=max_chunk_tokens,
+                rate_limiter=rate_limiter,
+                retry_budget=retry_budget,
             )
 
+    try:
+        result = Recommendations(jobs=asyncio.run(rank()))
+        cache.set(cache_key, result, cache_params)
         return result
 
     except json.JSONDecodeError as e:
@@ -288,3 +868,134 @@ def get_job_recommendations(
     except Exception as e:
         logger.exception(f"Error getting job recommendations: {e}")
         return None
+
+
+def _score_cache(resume: str, model: str, output_dir: Path) -> ScoreCache:
+    return ScoreCache(
+        Path(f"{output_dir}/scores"),
+        RecommendationCache.make_key(resume=hash_text(resume), model=model, prompt_version=scoring_prompt_version()),
+    )
+
+
+def get_pointwise_recommendations(
+    openai: OpenAI,
+    resume: str,
+    jobs: list[JobSchema],
+    num_recommendations: int = 5,
+    output_dir: Path = Path("results"),
+    rate_limiter: Optional[RateLimiter] = None,
+    retry_budget: Optional[RetryBudget] = None,
+    model: str = "gpt-4o",
+    max_concurrent: int = 50,
+) -> Recommendations:
+    """
+    Score every job independently against the resume and return the `num_recommendations` best.
+
+    Scores are stored per (resume, job) pair, keyed by the resume hash, the model, the prompt version
+    and the job's content fingerprint, so a rerun only scores jobs that are new or have changed.
+    Missing scores are requested concurrently and the top jobs are selected locally with a heap.
+    """
+    cache = _score_cache(resume, model, output_dir)
+    scores = cache.load()
+    fingerprints = [fingerprint_job(job) for job in jobs]
+    missing = list({fingerprint: job for fingerprint, job in zip(fingerprints, jobs) if fingerprint not in scores}.items())
+    logger.info(f"Scoring {len(missing)} of {len(jobs)} jobs ({len(jobs) - len(missing)} scores cached)")
+
+    async def score_missing() -> None:
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def score(fingerprint: str, job: JobSchema) -> tuple[str, Optional[JobScore]]:
+            async with semaphore:
+                try:
+                    return fingerprint, await score_job(client, resume, job, model, rate_limiter, retry_budget)
+                except Exception as e:
+                    logger.warning(f"Failed to score {job.apply_link}: {e}")
+                    return fingerprint, None
+
+        async with async_openai_client(openai) as client:
+            for next_score in atqdm.as_completed(
+                [score(fingerprint, job) for fingerprint, job in missing], desc="Scoring jobs"
+            ):
+                fingerprint, job_score = await next_score
+                if job_score:
+                    scores[fingerprint] = job_score
+                    cache.append(fingerprint, job_score)
+
+    if missing:
+        asyncio.run(score_missing())
+
+    scored = [(scores[fingerprint], position) for position, fingerprint in enumerate(fingerprints) if fingerprint in scores]
+    top = heapq.nlargest(num_recommendations, scored, key=lambda item: (item[0].score, -item[1]))
+    return Recommendations(
+        jobs=[
+            RecommendedJob(**jobs[position].model_dump(), score=job_score.score, reason=job_score.reason)
+            for job_score, position in top
+        ]
+    )
+
+
+def stream_job_recommendations(
+    links: list[str],
+    firecrawl: FirecrawlApp,
+    openai: OpenAI,
+    url: str,
+    resume: str,
+    num_recommendations: int = 5,
+    max_jobs: int = 20,
+    output_dir: Path = Path("results"),
+    resume_run: bool = False,
+    firecrawl_rate_limiter: Optional[RateLimiter] = None,
+    openai_rate_limiter: Optional[RateLimiter] = None,
+    max_concurrent: int = 20,
+    batch_size: int = 1,
+    retry_budget: Optional[RetryBudget] = None,
+    model: str = "gpt-4o",
+    score_batch_size: int = 10,
+    max_per_host: int = 0,
+    known_jobs: Optional[list[JobSchema]] = None,
+    structured_data: bool = False,
+    early_stop: Optional[EarlyStopPolicy] = None,
+) -> tuple[list[JobSchema], Recommendations]:
+    """
+    Extract jobs and rank them at the same time. Jobs are handed to a StreamingRanker as soon as
+    they are extracted, which keeps a live top-N (logged after every scored batch) and scores jobs
+    with the LLM in batches of `score_batch_size` while extraction continues.
+    Scores share the pointwise score cache. Returns the extracted jobs and the final recommendations.
+    """
+    cache, checkpoint = _extraction_stores(url, output_dir)
+    score_cache = _score_cache(resume, model, output_dir)
+
+    async def run() -> tuple[list[JobSchema], list[RecommendedJob]]:
+        async with async_openai_client(openai) as client:
+            ranker = StreamingRanker(
+                client,
+                resume,
+                num_recommendations,
+                score_cache,
+                model=model,
+                batch_size=score_batch_size,
+                rate_limiter=openai_rate_limiter,
+                retry_budget=retry_budget,
+            )
+            jobs = await process_job_links_async(
+                links,
+                firecrawl,
+                max_jobs=max_jobs,
+                max_concurrent=max_concurrent,
+                initial_concurrent=min(5, max_concurrent),
+                cache=cache,
+                checkpoint=checkpoint,
+                resume=resume_run,
+                rate_limiter=firecrawl_rate_limiter,
+                batch_size=batch_size,
+                retry_budget=retry_budget,
+                max_per_host=max_per_host,
+                known_jobs=known_jobs,
+                structured_data=structured_data,
+                on_job=ranker.add,
+                early_stop=early_stop,
+            )
+            return jobs, await ranker.finish()
+
+    jobs, recommended_jobs = asyncio.run(run())
+    return jobs, Recommendations(jobs=recommended_jobs)
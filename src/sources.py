@@ -0,0 +1,250 @@
+import asyncio
+import html
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from src.logger import logger
+from src.retry import RetryBudget, retry_async
+from src.types import JobSchema
+
+# Headings of the description sections that list what the role requires
+REQUIREMENT_HEADINGS = re.compile(
+    r"requirement|qualification|skills|you have|you'll have|you will have|you bring|you'll need|looking for|about you|experience",
+    re.IGNORECASE,
+)
+COMPENSATION_PATTERN = re.compile(
+    r"[$€£]\s?\d[\d,.]*\s?[kK]?\s*(?:-|–|—|to)\s*[$€£]?\s?\d[\d,.]*\s?[kK]?(?:\s?(?:USD|EUR|GBP))?"
+)
+MAX_SKILLS = 10
+
+
+class _RequirementsParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.heading = ""
+        self.in_heading = False
+        self.in_item = False
+        self.text: list[str] = []
+        self.items: list[tuple[str, str]] = []
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6", "strong", "b") and not self.in_item:
+            self.in_heading, self.text = True, []
+        elif tag == "li":
+            self.in_item, self.text = True, []
+
+    def handle_endtag(self, tag: str) -> None:
+        text = " ".join("".join(self.text).split())
+        if self.in_heading and tag in ("h1", "h2", "h3", "h4", "h5", "h6", "strong", "b"):
+            self.in_heading = False
+            if text:
+                self.heading = text
+        elif self.in_item and tag == "li":
+            self.in_item = False
+            if text:
+                self.items.append((self.heading, text))
+
+    def handle_data(self, data: str) -> None:
+        if self.in_heading or self.in_item:
+            self.text.append(data)
+
+
+def requirement_items(description_html: str, heading: str = "") -> list[str]:
+    """
+    Return the list items of the requirement sections of an HTML job description, used as the key skills
+    of postings that are not extracted by an LLM. If `heading` is given, it is the heading of the whole HTML.
+    """
+    parser = _RequirementsParser()
+    parser.heading = heading
+    parser.feed(html.unescape(description_html))
+    items = [item for item_heading, item in parser.items if REQUIREMENT_HEADINGS.search(item_heading)]
+    return items[:MAX_SKILLS]
+
+
+def find_compensation(description_html: str) -> str:
+    """
+    Return the first pay range mentioned in an HTML job description, or an empty string.
+    """
+    text = re.sub(r"<[^>]+>", " ", html.unescape(description_html))
+    match = COMPENSATION_PATTERN.search(text)
+    return " ".join(match.group(0).split()) if match else ""
+
+
+class SourceAdapter(ABC):
+    """
+    Fetches every posting of a job board from the applicant tracking system's public API.
+
+    An adapter recognises the board from the jobs page URL (`board_name`) and maps the board's postings
+    straight into `JobSchema`, so boards hosted on a supported ATS need neither a listing scrape nor an
+    LLM extraction per posting. `base_url` can point to a local stand-in server.
+    """
+
+    name = ""
+    default_base_url = ""
+
+    def __init__(self, base_url: Optional[str] = None) -> None:
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+
+    @abstractmethod
+    def board_name(self, url: str) -> Optional[str]:
+        """
+        Return the board name if the URL is a board of this ATS, otherwise None.
+        """
+
+    @abstractmethod
+    async def fetch_jobs(self, client: httpx.AsyncClient, board: str) -> list[JobSchema]:
+        """
+        Fetch every posting of a board.
+        """
+
+    async def _get(self, client: httpx.AsyncClient, path: str, params: dict[str, str]) -> Any:
+        response = await client.get(f"{self.base_url}{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
+
+def _first_path_segment(url: str, hosts: re.Pattern) -> Optional[str]:
+    parts = urlsplit(url.strip())
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if not hosts.match((parts.hostname or "").lower()) or not segments:
+        return None
+    return segments[0]
+
+
+class GreenhouseAdapter(SourceAdapter):
+    name = "greenhouse"
+    default_base_url = "https://boards-api.greenhouse.io"
+
+    def board_name(self, url: str) -> Optional[str]:
+        board = _first_path_segment(url, re.compile(r"^(?:job-)?boards(?:\.eu)?\.greenhouse\.io$"))
+        if board == "embed":
+            return parse_qs(urlsplit(url).query).get("for", [None])[0]
+        return board
+
+    async def fetch_jobs(self, client: httpx.AsyncClient, board: str) -> list[JobSchema]:
+        data = await self._get(client, f"/v1/boards/{board}/jobs", {"content": "true"})
+        return [
+            JobSchema(
+                job_title=job.get("title", ""),
+                sub_division_of_organization=", ".join(d["name"] for d in job.get("departments", [])),
+                key_skills=requirement_items(job.get("content", "")),
+                compensation=find_compensation(job.get("content", "")),
+                location=(job.get("location") or {}).get("name", ""),
+                apply_link=job.get("absolute_url", ""),
+            )
+            for job in data.get("jobs", [])
+        ]
+
+
+class LeverAdapter(SourceAdapter):
+    name = "lever"
+    default_base_url = "https://api.lever.co"
+
+    def board_name(self, url: str) -> Optional[str]:
+        return _first_path_segment(url, re.compile(r"^jobs(?:\.eu)?\.lever\.co$"))
+
+    @staticmethod
+    def _compensation(job: dict[str, Any]) -> str:
+        salary = job.get("salaryRange")
+        if not salary or salary.get("min") is None:
+            return find_compensation(job.get("additional", "") or job.get("description", ""))
+        interval = str(salary.get("interval", "")).replace("-", " ")
+        return f"{salary['min']:,}-{salary.get('max') or salary['min']:,} {salary.get('currency', '')} {interval}".strip()
+
+    async def fetch_jobs(self, client: httpx.AsyncClient, board: str) -> list[JobSchema]:
+        data = await self._get(client, f"/v0/postings/{board}", {"mode": "json"})
+        jobs = []
+        for job in data:
+            categories = job.get("categories") or {}
+            skills = [
+                skill
+                for section in job.get("lists", [])
+                for skill in requirement_items(section.get("content", ""), heading=section.get("text", ""))
+            ]
+            jobs.append(
+                JobSchema(
+                    job_title=job.get("text", ""),
+                    sub_division_of_organization=categories.get("team") or categories.get("department") or "",
+                    key_skills=skills[:MAX_SKILLS],
+                    compensation=self._compensation(job),
+                    location=categories.get("location", ""),
+                    apply_link=job.get("hostedUrl", ""),
+                )
+            )
+        return jobs
+
+
+class AshbyAdapter(SourceAdapter):
+    name = "ashby"
+    default_base_url = "https://api.ashbyhq.com"
+
+    def board_name(self, url: str) -> Optional[str]:
+        return _first_path_segment(url, re.compile(r"^jobs\.ashbyhq\.com$"))
+
+    async def fetch_jobs(self, client: httpx.AsyncClient, board: str) -> list[JobSchema]:
+        data = await self._get(client, f"/posting-api/job-board/{board}", {"includeCompensation": "true"})
+        return [
+            JobSchema(
+                job_title=job.get("title", ""),
+                sub_division_of_organization=job.get("team") or job.get("department") or "",
+                key_skills=requirement_items(job.get("descriptionHtml", "")),
+                compensation=(job.get("compensation") or {}).get("compensationTierSummary")
+                or find_compensation(job.get("descriptionHtml", "")),
+                location=job.get("location", ""),
+                apply_link=job.get("jobUrl", ""),
+            )
+            for job in data.get("jobs", [])
+            if job.get("isListed", True)
+        ]
+
+
+def default_adapters() -> list[SourceAdapter]:
+    return [GreenhouseAdapter(), LeverAdapter(), AshbyAdapter()]
+
+
+def find_adapter(url: str, adapters: Optional[list[SourceAdapter]] = None) -> Optional[tuple[SourceAdapter, str]]:
+    """
+    Return the adapter that recognises a jobs page URL and the board name it points to, if any.
+    """
+    for adapter in adapters or default_adapters():
+        if board := adapter.board_name(url):
+            return adapter, board
+    return None
+
+
+def fetch_board_jobs(
+    urls: list[str],
+    adapters: Optional[list[SourceAdapter]] = None,
+    retry_budget: Optional[RetryBudget] = None,
+) -> dict[str, list[JobSchema]]:
+    """
+    Fetch the postings of every jobs page URL that is hosted on a supported ATS, concurrently.
+    Returns the jobs per URL; URLs that are not recognised, or whose board could not be fetched,
+    are left out so they can fall back to scraping and extraction with Firecrawl.
+    """
+    matches = {url: match for url in urls if (match := find_adapter(url, adapters))}
+
+    async def fetch(client: httpx.AsyncClient, url: str, adapter: SourceAdapter, board: str) -> Optional[list[JobSchema]]:
+        try:
+            jobs = await retry_async(
+                lambda: adapter.fetch_jobs(client, board), f"{adapter.name} board {board}", retry_budget
+            )
+        except Exception as e:
+            logger.warning(f"Failed to fetch the {adapter.name} board {board}, falling back to Firecrawl: {e}")
+            return None
+        logger.info(f"Fetched {len(jobs)} jobs from the {adapter.name} board {board}")
+        return jobs
+
+    async def fetch_all() -> list[Optional[list[JobSchema]]]:
+        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            return await asyncio.gather(*(fetch(client, url, *match) for url, match in matches.items()))
+
+    if not matches:
+        return {}
+    results = asyncio.run(fetch_all())
+    return {url: jobs for url, jobs in zip(matches, results) if jobs is not None}
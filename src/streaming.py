@@ -0,0 +1,120 @@
+import asyncio
+import heapq
+from typing import Optional
+
+from openai import AsyncOpenAI
+
+from src.bm25 import ResumeMatcher
+from src.cache import ScoreCache, fingerprint_job
+from src.logger import logger
+from src.ranking import score_job
+from src.rate_limit import RateLimiter
+from src.retry import RetryBudget
+from src.types import JobSchema, JobScore, RecommendedJob
+
+
+class StreamingRanker:
+    """
+    Live top-N ranking of jobs while they are still being extracted.
+
+    Every job is scored locally against the resume as soon as it arrives, so a provisional top-N
+    exists right away. Arriving jobs are also collected into batches of `batch_size`, and each full
+    batch is scored by the LLM in the background (pointwise, through the score cache). Once the first
+    batch is scored, the top-N is made of LLM-scored jobs and is refined as more batches complete.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        resume: str,
+        num_recommendations: int,
+        score_cache: ScoreCache,
+        model: str = "gpt-4o",
+        batch_size: int = 10,
+        max_concurrent: int = 50,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_budget: Optional[RetryBudget] = None,
+    ) -> None:
+        self.client = client
+        self.resume = resume
+        self.num_recommendations = num_recommendations
+        self.score_cache = score_cache
+        self.model = model
+        self.batch_size = batch_size
+        self.rate_limiter = rate_limiter
+        self.retry_budget = retry_budget
+
+        self.matcher = ResumeMatcher(resume)
+        self.scores = score_cache.load()
+        self.jobs: dict[str, JobSchema] = {}
+        self.local_scores: dict[str, float] = {}
+        self.pending: list[str] = []
+        self.tasks: set[asyncio.Task] = set()
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+    def add(self, job: JobSchema) -> None:
+        """
+        Add an extracted job. Must be called from within the running event loop.
+        """
+        fingerprint = fingerprint_job(job)
+        if fingerprint in self.jobs:
+            return
+        self.jobs[fingerprint] = job
+        self.local_scores[fingerprint] = self.matcher.score_job(job)
+        if fingerprint not in self.scores:
+            self.pending.append(fingerprint)
+        if len(self.pending) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.create_task(self._score_batch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _score(self, fingerprint: str) -> None:
+        async with self.semaphore:
+            try:
+                job_score = await score_job(
+                    self.client, self.resume, self.jobs[fingerprint], self.model, self.rate_limiter, self.retry_budget
+                )
+            except Exception as e:
+                logger.warning(f"Failed to score {self.jobs[fingerprint].apply_link}: {e}")
+                return
+        self.scores[fingerprint] = job_score
+        self.score_cache.append(fingerprint, job_score)
+
+    async def _score_batch(self, batch: list[str]) -> None:
+        await asyncio.gather(*(self._score(fingerprint) for fingerprint in batch))
+        top = ", ".join(f"{job.job_title} ({job.score:.0f})" for job in self.top())
+        logger.info(f"Live top {self.num_recommendations} after {len(self.jobs)} jobs: {top}")
+
+    def top(self) -> list[RecommendedJob]:
+        """
+        Return the current top-N. Jobs scored by the LLM rank first; jobs that are still waiting for
+        their LLM score are ordered by their local score.
+        """
+        scored = [
+            (
+                fingerprint in self.scores,
+                fingerprint,
+                self.scores.get(fingerprint)
+                or JobScore(score=self.local_scores[fingerprint], reason="Not scored by the LLM yet"),
+            )
+            for fingerprint in self.jobs
+        ]
+        top = heapq.nlargest(self.num_recommendations, scored, key=lambda item: (item[0], item[2].score))
+        return [
+            RecommendedJob(**self.jobs[fingerprint].model_dump(), score=job_score.score, reason=job_score.reason)
+            for _, fingerprint, job_score in top
+        ]
+
+    async def finish(self) -> list[RecommendedJob]:
+        """
+        Score the remaining jobs, wait for every batch and return the final top-N.
+        """
+        self._flush()
+        while self.tasks:
+            await asyncio.gather(*self.tasks)
+        return self.top()
@@ -0,0 +1,209 @@
+import json
+import re
+from html.parser import HTMLParser
+from typing import Any, Iterator, Optional
+
+from src.link_discovery import VOID_TAGS
+from src.sources import find_compensation, requirement_items
+from src.types import JobSchema
+
+
+# Address properties of the posting's nested jobLocation item, flattened into the posting
+ADDRESS_PROPERTIES = ("addressLocality", "addressRegion", "addressCountry")
+
+
+class _StructuredDataParser(HTMLParser):
+    """
+    Collects the JSON-LD blocks of a page and the microdata properties of its first JobPosting item.
+    Properties of items nested in the posting (hiring organization, salary, ...) are skipped, except
+    the address of its job location.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.json_ld: list[str] = []
+        self.microdata: dict[str, list[str]] = {}
+        self._in_json_ld = False
+        self._text: list[str] = []
+        self._stack: list[str] = []
+        self._posting_depth: Optional[int] = None
+        self._posting_done = False
+        self._nested_items: list[tuple[int, str]] = []
+        self._property: Optional[tuple[str, int]] = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        attributes = {name: value or "" for name, value in attrs}
+        if tag == "script" and attributes.get("type", "").lower() == "application/ld+json":
+            self._in_json_ld, self._text = True, []
+            return
+        if tag in VOID_TAGS:
+            # Void elements carry their value in `content` and have no end tag
+            if "itemprop" in attributes and "content" in attributes:
+                self._add(attributes["itemprop"], attributes["content"])
+            return
+
+        self._stack.append(tag)
+        depth = len(self._stack)
+        if self._posting_depth is None:
+            if not self._posting_done and "JobPosting" in attributes.get("itemtype", ""):
+                self._posting_depth = depth
+        elif "itemscope" in attributes:
+            self._nested_items.append((depth, attributes.get("itemprop", "")))
+        elif "itemprop" in attributes:
+            if "content" in attributes:
+                self._add(attributes["itemprop"], attributes["content"])
+            elif self._property is None:
+                self._property, self._text = (attributes["itemprop"], depth), []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "script" and self._in_json_ld:
+            self._in_json_ld = False
+            self.json_ld.append("".join(self._text))
+            return
+        if tag in VOID_TAGS or tag not in self._stack:
+            return
+
+        # Elements left open (e.g. `<p>` and `<li>` without end tags) are closed along with this one
+        start = len(self._stack) - 1 - self._stack[::-1].index(tag)
+        while len(self._stack) > start:
+            self._close_element(len(self._stack))
+            self._stack.pop()
+
+    def _close_element(self, depth: int) -> None:
+        if self._property and self._property[1] == depth:
+            self._add(self._property[0], " ".join("".join(self._text).split()))
+            self._property = None
+        if self._nested_items and self._nested_items[-1][0] == depth:
+            self._nested_items.pop()
+        if self._posting_depth == depth:
+            # Only the first JobPosting item is read
+            self._posting_depth, self._posting_done = None, True
+
+    def handle_data(self, data: str) -> None:
+        if self._in_json_ld or self._property:
+            self._text.append(data)
+
+    def _add(self, name: str, value: str) -> None:
+        if not value or self._posting_depth is None:
+            return
+        for prop in name.split():
+            if not self._nested_items or (self._nested_items[0][1] == "jobLocation" and prop in ADDRESS_PROPERTIES):
+                self.microdata.setdefault(prop, []).append(value)
+
+
+def _walk(value: Any) -> Iterator[dict[str, Any]]:
+    if isinstance(value, list):
+        for item in value:
+            yield from _walk(item)
+    elif isinstance(value, dict):
+        yield value
+        for key in ("@graph", "mainEntity", "mainEntityOfPage"):
+            if key in value:
+                yield from _walk(value[key])
+
+
+def _is_job_posting(item: dict[str, Any]) -> bool:
+    types = item.get("@type", [])
+    return "JobPosting" in (types if isinstance(types, list) else [types])
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, list):
+        return ", ".join(filter(None, (_text(item) for item in value)))
+    if isinstance(value, dict):
+        return _text(value.get("name") or value.get("value") or "")
+    return " ".join(str(value).split()) if value is not None else ""
+
+
+def _location(posting: dict[str, Any]) -> str:
+    places = posting.get("jobLocation") or []
+    locations = []
+    for place in places if isinstance(places, list) else [places]:
+        address = place.get("address", place) if isinstance(place, dict) else place
+        if isinstance(address, dict):
+            parts = [_text(address.get(key)) for key in ("addressLocality", "addressRegion", "addressCountry")]
+            locations.append(", ".join(part for part in parts if part))
+        else:
+            locations.append(_text(address))
+    if "TELECOMMUTE" in _text(posting.get("jobLocationType")).upper():
+        locations.append("Remote")
+    return "; ".join(location for location in locations if location)
+
+
+def _compensation(posting: dict[str, Any]) -> str:
+    salary = posting.get("baseSalary") or posting.get("estimatedSalary")
+    if isinstance(salary, list):
+        salary = salary[0] if salary else None
+    if isinstance(salary, dict):
+        value = salary.get("value", salary)
+        currency = _text(salary.get("currency"))
+        if isinstance(value, dict):
+            low, high = value.get("minValue"), value.get("maxValue")
+            amount = f"{low}-{high}" if low is not None and high is not None else _text(value.get("value") or low or high)
+            unit = _text(value.get("unitText")).lower()
+            return " ".join(part for part in (amount, currency, f"per {unit}" if unit else "") if part)
+        if value:
+            return f"{_text(value)} {currency}".strip()
+    return find_compensation(_text(posting.get("description")))
+
+
+def _skills(posting: dict[str, Any]) -> list[str]:
+    for key in ("skills", "qualifications", "experienceRequirements"):
+        value = posting.get(key)
+        if isinstance(value, str) and "<li" not in value:
+            items = [item.strip() for item in re.split(r"[,;\n]", value) if item.strip()]
+        elif isinstance(value, list):
+            items = [_text(item) for item in value]
+        elif isinstance(value, str):
+            items = requirement_items(value, heading="Requirements")
+        else:
+            continue
+        if items:
+            return items
+    return requirement_items(str(posting.get("description") or ""))
+
+
+def job_from_posting(posting: dict[str, Any], url: str) -> Optional[JobSchema]:
+    """
+    Map a schema.org JobPosting into a JobSchema. Returns None when the posting lacks a title or
+    anything to take the key skills from, so the page goes through LLM extraction instead.
+    """
+    title = _text(posting.get("title") or posting.get("name"))
+    skills = _skills(posting)
+    if not title or not skills:
+        return None
+
+    return JobSchema(
+        job_title=title,
+        sub_division_of_organization=_text(
+            posting.get("department") or posting.get("occupationalCategory") or posting.get("industry")
+        ),
+        key_skills=skills,
+        compensation=_compensation(posting),
+        location=_location(posting),
+        apply_link=url,
+    )
+
+
+def parse_job_posting(page_html: str, url: str) -> Optional[JobSchema]:
+    """
+    Build a job from the schema.org JobPosting structured data of a page (JSON-LD, or else microdata),
+    without an LLM. Returns None if the page has no usable JobPosting.
+    """
+    parser = _StructuredDataParser()
+    parser.feed(page_html)
+
+    for block in parser.json_ld:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for item in _walk(data):
+            if _is_job_posting(item) and (job := job_from_posting(item, url)):
+                return job
+
+    if parser.microdata:
+        posting: dict[str, Any] = {key: values if len(values) > 1 else values[0] for key, values in parser.microdata.items()}
+        posting["jobLocation"] = {key: posting.pop(key) for key in ADDRESS_PROPERTIES if key in posting}
+        return job_from_posting(posting, url)
+    return None
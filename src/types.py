@@ -1,4 +1,5 @@
-from typing import Any, TypedDict
+from enum import Enum
+from typing import Any, Optional, TypedDict
 
 from pydantic import BaseModel
 
@@ -15,8 +16,14 @@ class ExtractEndpointSchema(TypedDict):
     expiresAt: str
 
 
-class ApplyLinksSchema(BaseModel):
-    apply_links: list[str]
+class JobListing(BaseModel):
+    apply_link: str
+    title: str
+    team: str
+
+
+class JobListingsSchema(BaseModel):
+    job_listings: list[JobListing]
 
 
 class JobSchema(BaseModel):
@@ -30,3 +37,38 @@ class JobSchema(BaseModel):
 
 class JobSchemas(BaseModel):
     jobs: list[JobSchema]
+
+
+class JobRanking(BaseModel):
+    id: int
+    score: float
+    reason: str
+
+
+class JobRankings(BaseModel):
+    rankings: list[JobRanking]
+
+
+class JobScore(BaseModel):
+    score: float
+    reason: str
+
+
+class RecommendedJob(JobSchema):
+    score: Optional[float] = None
+    reason: str = ""
+
+
+class Recommendations(BaseModel):
+    jobs: list[RecommendedJob]
+
+
+class Ranker(str, Enum):
+    llm = "llm"
+    pointwise = "pointwise"
+    bm25 = "bm25"
+
+
+class Preranker(str, Enum):
+    embedding = "embedding"
+    bm25 = "bm25"
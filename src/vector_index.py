@@ -0,0 +1,134 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Return the indices of the `k` highest scores, highest first, using `argpartition`
+    so only the top `k` entries are sorted.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates])]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize vectors (rows) as float32, so cosine similarity becomes a dot product.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class VectorIndex:
+    """
+    Persistent, append-only embedding matrix with exact top-K cosine search.
+
+    Normalized float32 vectors are stored row by row in `vectors.f32` and memory-mapped on load,
+    and `keys.txt` holds the key of every row in the same order. Scoring a query is a single
+    matrix-vector product followed by `argpartition`, so even 100k rows are searched in milliseconds
+    without loading the matrix into Python objects.
+    """
+
+    def __init__(self, index_dir: Path) -> None:
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.index_dir / "vectors.f32"
+        self.keys_path = self.index_dir / "keys.txt"
+        self.meta_path = self.index_dir / "meta.json"
+
+        self.dim: Optional[int] = None
+        if self.meta_path.exists():
+            self.dim = json.loads(self.meta_path.read_text())["dim"]
+
+        self.keys: list[str] = []
+        if self.keys_path.exists():
+            text = self.keys_path.read_text(encoding="utf-8")
+            self.keys = text.splitlines()
+            if text and not text.endswith("\n"):
+                # Torn final key from a crash mid-write
+                self.keys.pop()
+        self._matrix: Optional[np.ndarray] = None
+        if self.dim:
+            self._repair()
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+
+    def _repair(self) -> None:
+        """
+        Bring `vectors.f32` and `keys.txt` back in step after a crash between (or during) their writes.
+        Orphan or torn rows are truncated away, so the next `add` appends right after the last keyed row.
+        """
+        row_size = 4 * (self.dim or 0)
+        size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        num_rows = min(len(self.keys), size // row_size)
+        if size != num_rows * row_size:
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(num_rows * row_size)
+        torn = self.keys_path.exists() and not self.keys_path.read_text(encoding="utf-8").endswith("\n")
+        if len(self.keys) != num_rows or torn:
+            self.keys = self.keys[:num_rows]
+            self.keys_path.write_text("".join(f"{key}\n" for key in self.keys), encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        The memory-mapped (num_rows, dim) matrix of normalized vectors.
+        """
+        if self._matrix is None or len(self._matrix) != len(self.keys):
+            if not self.keys or self.dim is None:
+                return np.empty((0, self.dim or 0), dtype=np.float32)
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.keys), self.dim))
+        return self._matrix
+
+    def add(self, keys: list[str], vectors: np.ndarray) -> None:
+        """
+        Append vectors for new keys. Keys that are already indexed are skipped.
+        """
+        vectors = normalize(vectors)
+        new = [i for i, key in enumerate(keys) if key not in self.rows]
+        if not new:
+            return
+
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            self.meta_path.write_text(json.dumps({"dim": self.dim}))
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors[new].tobytes())
+        with open(self.keys_path, "a", encoding="utf-8") as f:
+            f.writelines(f"{keys[i]}\n" for i in new)
+
+        for i in new:
+            self.rows[keys[i]] = len(self.keys)
+            self.keys.append(keys[i])
+
+    def get(self, keys: list[str]) -> np.ndarray:
+        """
+        Return the stored vectors for the given keys, in order.
+        """
+        return np.asarray(self.matrix[[self.rows[key] for key in keys]])
+
+    def search(self, query: np.ndarray, k: int, keys: Optional[list[str]] = None) -> list[tuple[int, float]]:
+        """
+        Return the `k` rows most similar to the query as (position, score) pairs, most similar first.
+
+        If `keys` is given, only those entries are searched and positions index into `keys`;
+        otherwise the whole index is searched and positions are row numbers.
+        """
+        matrix = self.matrix if keys is None else self.get(keys)
+        scores = matrix @ normalize(query)
+        return [(int(i), float(scores[i])) for i in top_k_indices(scores, k)]